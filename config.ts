@@ -17,11 +17,22 @@ export const serverConfig = {
     process.env.QUALITY_CHECK_TEMPERATURE || '0.1',
   ),
   openaiApiKey: process.env.OPENAI_API_KEY || '',
+  openaiRequestTimeoutMs: Number(process.env.OPENAI_REQUEST_TIMEOUT_MS || '600000'),
+  openaiMaxRetries: Number(process.env.OPENAI_MAX_RETRIES || '5'),
   maxTokens: Number(process.env.MAX_TOKENS || '16000'),
+  maxReferenceTokens: Number(process.env.MAX_REFERENCE_TOKENS || '0'),
   tokenizerModel: process.env.TOKENIZER_MODEL || 'Xenova/gpt-4o',
   maxTranslationOutputTokens: Number(process.env.MAX_TRANSLATION_OUTPUT_TOKENS || '8000'),
   maxQualityCheckOutputTokens: Number(process.env.MAX_QUALITY_CHECK_OUTPUT_TOKENS || process.env.MAX_TRANSLATION_OUTPUT_TOKENS || '8000'),
   translationUseStreaming: getEnvBoolean('TRANSLATION_USE_STREAMING', false),
+  // Exact-match translation response cache (always on when temperature is 0)
+  translationCacheEnable: getEnvBoolean('TRANSLATION_CACHE_ENABLE', false),
+  translationCacheSize: Number(process.env.TRANSLATION_CACHE_SIZE || '1024'),
+  translationCacheTtlSeconds: Number(process.env.TRANSLATION_CACHE_TTL_SECONDS || '86400'),
+  // Semantic cache: reuse the translation of a near-identical source text
+  semanticCacheEnable: getEnvBoolean('TRANSLATION_SEMANTIC_CACHE_ENABLE', false),
+  semanticCacheThreshold: Number(process.env.TRANSLATION_SEMANTIC_CACHE_THRESHOLD || '0.95'),
+  embeddingModel: process.env.EMBEDDING_MODEL || 'Xenova/paraphrase-multilingual-MiniLM-L12-v2',
   // Feature flag: enable per-novel model and token limit configuration
   modelConfigEnable: getEnvBoolean('ENABLE_MODEL_CONFIG', false),
   // Feature flag: enable translation toolcalls globally; per-novel override when modelConfigEnable=true
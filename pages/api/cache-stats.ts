@@ -0,0 +1,13 @@
+import type { NextApiRequest, NextApiResponse } from 'next';
+import { getTranslationCacheStats } from '@/utils/responseCache';
+
+export default async function handler(
+  req: NextApiRequest,
+  res: NextApiResponse,
+) {
+  if (req.method === 'GET') {
+    return res.status(200).json({ translation: getTranslationCacheStats() });
+  }
+
+  return res.status(405).json({ message: 'Method not allowed' });
+}
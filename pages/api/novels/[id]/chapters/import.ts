@@ -1,5 +1,5 @@
 import { NextApiRequest, NextApiResponse } from 'next';
-import { saveChapter, deleteNovelChapters } from '@/utils/chapterStorage';
+import { saveChapters } from '@/utils/chapterStorage';
 import { getNovelById } from '@/utils/fileStorage';
 
 export const config = {
@@ -142,26 +142,29 @@ export default async function handler(
       return res.status(400).json({ message: 'No chapters found in content' });
     }
 
-    if (mode === 'replace') {
-      await deleteNovelChapters(novelId);
-    }
-
     let minNumber = Number.POSITIVE_INFINITY;
     let maxNumber = 0;
+    const now = Date.now();
 
     for (const ch of chapters) {
       minNumber = Math.min(minNumber, ch.number);
       maxNumber = Math.max(maxNumber, ch.number);
-      await saveChapter(novelId, {
+    }
+
+    // Import atomically: a failure part-way leaves the existing chapters untouched
+    await saveChapters(
+      novelId,
+      chapters.map((ch) => ({
         id: '',
         number: ch.number,
         title: ch.title || `Chapter ${ch.number}`,
         sourceContent: ch.sourceContent,
         translatedContent: ch.translatedContent,
-        createdAt: Date.now(),
-        updatedAt: Date.now(),
-      });
-    }
+        createdAt: now,
+        updatedAt: now,
+      })),
+      { replace: mode === 'replace' },
+    );
 
     return res.status(200).json({
       message: 'Chapters imported successfully',
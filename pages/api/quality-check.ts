@@ -1,6 +1,7 @@
 import type { NextApiRequest, NextApiResponse } from 'next';
 import axios from 'axios';
 import { QualityCheckResponse } from '@/types';
+import { llmClient } from '@/utils/llmClient';
 import { serverConfig } from '../../config';
 import { getNovelById } from '@/utils/fileStorage';
 
@@ -127,7 +128,7 @@ ${translatedContent}
 `;
 
   try {
-    const apiResponse = await axios.post(
+    const apiResponse = await llmClient.post(
       url,
       {
         model,
@@ -160,8 +161,10 @@ ${translatedContent}
       },
     );
 
+    // The axios response also carries the request config, including the
+    // whole prompt, so only log the parts that are useful
     console.log('quality check response', {
-      response: apiResponse,
+      id: apiResponse.data.id,
       content: apiResponse.data.choices[0].message.content,
       usage: apiResponse.data.usage,
     });
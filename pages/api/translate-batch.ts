@@ -0,0 +1,59 @@
+import type { NextApiRequest, NextApiResponse } from 'next';
+import axios from 'axios';
+import { getNovelById } from '@/utils/fileStorage';
+import { MAX_TEXTS_PER_REQUEST, translateTexts } from '@/utils/batchTranslate';
+
+interface BatchTranslationRequest {
+  novelId: string;
+  texts: string[];
+}
+
+export default async function handler(
+  req: NextApiRequest,
+  res: NextApiResponse,
+) {
+  if (req.method !== 'POST') {
+    return res.status(405).json({ message: 'Method not allowed' });
+  }
+
+  try {
+    const { novelId, texts } = req.body as BatchTranslationRequest;
+    if (!novelId) {
+      return res.status(400).json({ message: 'Novel ID is required' });
+    }
+    if (!Array.isArray(texts) || texts.some((text) => typeof text !== 'string')) {
+      return res.status(400).json({ message: 'texts must be an array of strings' });
+    }
+    if (texts.length > MAX_TEXTS_PER_REQUEST) {
+      return res
+        .status(400)
+        .json({ message: `At most ${MAX_TEXTS_PER_REQUEST} texts can be translated per request` });
+    }
+
+    const novel = await getNovelById(novelId);
+    if (!novel) {
+      return res.status(404).json({ message: 'Novel not found' });
+    }
+
+    const translations = await translateTexts(novel, texts);
+
+    return res.status(200).json({
+      translations,
+      sourceLanguage: novel.sourceLanguage,
+      targetLanguage: novel.targetLanguage,
+    });
+  } catch (error: unknown) {
+    if (axios.isAxiosError(error)) {
+      console.error('API error:', error.response?.data || error.message);
+      return res.status(500).json({
+        message: 'Error processing batch translation',
+        error: error.message,
+      });
+    }
+    const message = error instanceof Error ? error.message : `${error}`;
+    return res.status(500).json({
+      message: 'Error processing batch translation',
+      error: message,
+    });
+  }
+}
@@ -1,11 +1,28 @@
 import type { NextApiRequest, NextApiResponse } from 'next';
 import axios from 'axios';
-import { NovelWithChapters, Reference, TranslationPostprocessOptions } from '@/types';
+import { StringDecoder } from 'string_decoder';
+import { NovelWithChapters } from '@/types';
 import { truncateContext } from '@/utils/tokenizer';
-import { getNovelById } from '@/utils/fileStorage';
+import { getReferencesText, postprocessOptions } from '@/utils/translationPrompt';
+import { getContextChapters, getNovelById } from '@/utils/fileStorage';
 import { postProcessTranslation } from '@/utils/postProcessTranslation';
 import { extractToolcallsAndStrip } from '@/utils/extractToolcalls';
 import { normalizeToolCalls } from '@/utils/toolCalls';
+import { buildCompletionPayload, llmClient } from '@/utils/llmClient';
+import {
+  CachedTranslation,
+  getCachedTranslation,
+  getTranslationCacheKey,
+  isTranslationCacheEnabled,
+  setCachedTranslation,
+} from '@/utils/responseCache';
+import {
+  addSemanticEntry,
+  embedSource,
+  findSemanticMatch,
+  getSemanticSettingsHash,
+} from '@/utils/semanticCache';
+import { singleFlight } from '@/utils/singleFlight';
 import { serverConfig } from '../../config';
 
 interface ChatMessage {
@@ -23,13 +40,6 @@ interface MinimalTranslationRequest {
   useStreaming?: boolean;
 }
 
-const postprocessOptions: TranslationPostprocessOptions = {
-  removeXmlTags: serverConfig.postprocessRemoveXmlTags,
-  removeCodeBlocks: serverConfig.postprocessRemoveCodeBlocks,
-  trimWhitespace: serverConfig.postprocessTrimWhitespace,
-  truncateAfterSecondHeader: serverConfig.postprocessTruncateAfterSecondHeader,
-};
-
 async function makeTranslationRequest(
   url: string,
   messages: ChatMessage[],
@@ -38,40 +48,9 @@ async function makeTranslationRequest(
   apiKey: string,
   maxOutputTokens: number,
 ) {
-  const response = await axios.post(
+  const response = await llmClient.post(
     url,
-    {
-      model,
-      messages,
-      temperature,
-      max_tokens: maxOutputTokens,
-      ...(model.includes('gemini')
-        ? {
-            safetySettings: [
-              {
-                category: 'HARM_CATEGORY_HARASSMENT',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_HATE_SPEECH',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_SEXUALLY_EXPLICIT',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_DANGEROUS_CONTENT',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_CIVIC_INTEGRITY',
-                threshold: 'BLOCK_NONE',
-              },
-            ],
-          }
-        : {}),
-    },
+    buildCompletionPayload(model, messages, temperature, maxOutputTokens),
     {
       headers: {
         'Content-Type': 'application/json',
@@ -82,6 +61,71 @@ async function makeTranslationRequest(
   return response;
 }
 
+// Incrementally parses an upstream chat completion SSE stream, accumulating
+// the streamed content, finish reason and usage
+function createStreamAccumulator() {
+  // Decode as a stream so multi-byte characters split across chunks survive
+  const decoder = new StringDecoder('utf8');
+  let buffer = '';
+  let content = '';
+  let finishReason: string | null = null;
+  let usage: CachedTranslation['usage'];
+  let doneSeen = false;
+
+  const handleEvent = (eventBlock: string) => {
+    // Each event block may contain multiple lines; parse lines starting with `data:`
+    const lines = eventBlock.split('\n');
+    for (const line of lines) {
+      const trimmed = line.trim();
+      if (!trimmed.startsWith('data:')) continue;
+      const dataStr = trimmed.slice('data:'.length).trim();
+      if (!dataStr) continue;
+      if (dataStr === '[DONE]') {
+        doneSeen = true;
+        continue;
+      }
+      try {
+        const parsed = JSON.parse(dataStr);
+        const choice = parsed.choices?.[0];
+        const deltaContent: string | undefined = choice?.delta?.content;
+        if (typeof deltaContent === 'string') {
+          content += deltaContent;
+        }
+        if (choice && choice.finish_reason) {
+          finishReason = choice.finish_reason;
+        }
+        if (parsed.usage) {
+          usage = parsed.usage;
+        }
+      } catch {
+        // Ignore JSON parse errors for non-JSON lines
+      }
+    }
+  };
+
+  return {
+    push(chunk: Buffer) {
+      buffer += decoder.write(chunk);
+      // SSE events are separated by double newlines
+      let idx: number;
+      while ((idx = buffer.indexOf('\n\n')) !== -1) {
+        const eventBlock = buffer.slice(0, idx);
+        buffer = buffer.slice(idx + 2);
+        handleEvent(eventBlock);
+      }
+    },
+    finish() {
+      // Handle any remaining buffer
+      buffer += decoder.end();
+      if (buffer.length > 0) {
+        handleEvent(buffer);
+        buffer = '';
+      }
+      return { content, usage, finishReason, doneSeen };
+    },
+  };
+}
+
 async function makeStreamingTranslationRequest(
   url: string,
   messages: ChatMessage[],
@@ -95,42 +139,9 @@ async function makeStreamingTranslationRequest(
   finishReason: string | null;
   headers: Record<string, string>;
 }> {
-  const response = await axios.post(
+  const response = await llmClient.post(
     url,
-    {
-      model,
-      messages,
-      temperature,
-      max_tokens: maxOutputTokens,
-      stream: true,
-      stream_options: { include_usage: true },
-      ...(model.includes('gemini')
-        ? {
-            safetySettings: [
-              {
-                category: 'HARM_CATEGORY_HARASSMENT',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_HATE_SPEECH',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_SEXUALLY_EXPLICIT',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_DANGEROUS_CONTENT',
-                threshold: 'BLOCK_NONE',
-              },
-              {
-                category: 'HARM_CATEGORY_CIVIC_INTEGRITY',
-                threshold: 'BLOCK_NONE',
-              },
-            ],
-          }
-        : {}),
-    },
+    buildCompletionPayload(model, messages, temperature, maxOutputTokens, { stream: true }),
     {
       headers: {
         'Content-Type': 'application/json',
@@ -142,59 +153,14 @@ async function makeStreamingTranslationRequest(
 
   const stream: NodeJS.ReadableStream = response.data;
   return await new Promise((resolve, reject) => {
-    let buffer = '';
-    let content = '';
-    let finishReason: string | null = null;
-    let usage: { prompt_tokens?: number; completion_tokens?: number; total_tokens?: number } | undefined;
-    let doneSeen = false;
-
-    const handleEvent = (eventBlock: string) => {
-      // Each event block may contain multiple lines; parse lines starting with `data:`
-      const lines = eventBlock.split('\n');
-      for (const line of lines) {
-        const trimmed = line.trim();
-        if (!trimmed.startsWith('data:')) continue;
-        const dataStr = trimmed.slice('data:'.length).trim();
-        if (!dataStr) continue;
-        if (dataStr === '[DONE]') {
-          doneSeen = true;
-          continue;
-        }
-        try {
-          const parsed = JSON.parse(dataStr);
-          const choice = parsed.choices?.[0];
-          const deltaContent: string | undefined = choice?.delta?.content;
-          if (typeof deltaContent === 'string') {
-            content += deltaContent;
-          }
-          if (choice && choice.finish_reason) {
-            finishReason = choice.finish_reason;
-          }
-          if (parsed.usage) {
-            usage = parsed.usage;
-          }
-        } catch {
-          // Ignore JSON parse errors for non-JSON lines
-        }
-      }
-    };
+    const accumulator = createStreamAccumulator();
 
     stream.on('data', (chunk: Buffer) => {
-      buffer += chunk.toString('utf8');
-      // SSE events are separated by double newlines
-      let idx: number;
-      while ((idx = buffer.indexOf('\n\n')) !== -1) {
-        const eventBlock = buffer.slice(0, idx);
-        buffer = buffer.slice(idx + 2);
-        handleEvent(eventBlock);
-      }
+      accumulator.push(chunk);
     });
 
     stream.on('end', () => {
-      // Handle any remaining buffer
-      if (buffer.length > 0) {
-        handleEvent(buffer);
-      }
+      const { content, usage, finishReason, doneSeen } = accumulator.finish();
       if (!doneSeen) {
         return reject(new Error('Streaming response ended without [DONE] marker. Incomplete response.'));
       }
@@ -207,6 +173,66 @@ async function makeStreamingTranslationRequest(
   });
 }
 
+// Extract toolcalls, then post-process translation text, and return it along
+// with the novel's language settings for quality check
+function buildTranslationResponse(
+  novel: NovelWithChapters,
+  translation: string,
+  tokenUsage: CachedTranslation['usage'],
+  finishReason: string | null,
+  tokenCounts: { system: number; task: number; translation: number },
+) {
+  const { translation: strippedTranslation, toolcalls } = extractToolcallsAndStrip(translation);
+  const normalizedToolCalls = normalizeToolCalls(toolcalls);
+  const postProcessedTranslation = postProcessTranslation(strippedTranslation, postprocessOptions);
+
+  return {
+    translation: postProcessedTranslation,
+    toolCalls: normalizedToolCalls,
+    tokenUsage: tokenUsage || { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 },
+    sourceLanguage: novel.sourceLanguage,
+    targetLanguage: novel.targetLanguage,
+    tokenCounts: {
+      system: tokenCounts.system,
+      task: tokenCounts.task,
+      translation: tokenCounts.translation,
+    },
+    finishReason,
+  };
+}
+
+const DEFAULT_TRANSLATION_TEMPLATE =
+  'Translate the following text from ${sourceLanguage} to ${targetLanguage}. Make sure to preserve and translate the header.${improvementPrompt}\n\n${sourceContent}';
+
+const TOOLING_INSTRUCTIONS = `Formatting instructions for reference updates:
+1) Output ONLY the final translation text first (no tags or code blocks).
+2) If you propose reference changes, append exactly one fenced block afterwards:
+\`\`\`toolcalls
+{"reference_ops": [ /* zero or more ops */ ]}
+\`\`\`
+- Allowed ops: "reference.add", "reference.update".
+- Prefer using existing reference \"id\" for updates; otherwise use exact \"title\".
+- Keep each op concise. Do not include this block if there are no changes.
+- Example:
+\`\`\`toolcalls
+{"reference_ops": [
+  {"type": "reference.add", "title": "John Doe", "content": "John Doe (ジョン・ドゥ) is a character in the story."},
+  {"type": "reference.update", "id": "123", "title": "Jane Doe", "content": "Jane Doe (ジェーン・ドウ) is a character in the story."}
+]}
+\`\`\`
+
+Use references to keep track of information that would be helpful for future translations, such as character names, locations, etc.`;
+
+// Optionally include tool instructions depending on per-novel or global config
+function isToolCallsEnabled(novel: NovelWithChapters): boolean {
+  return (serverConfig.modelConfigEnable && (novel.translationToolCallsEnable ?? null) !== null)
+    ? Boolean(novel.translationToolCallsEnable)
+    : serverConfig.translationToolCallsEnable;
+}
+
+// Chapters whose latest quality check scored lower aren't used as context
+const MIN_CONTEXT_QUALITY_SCORE = 6;
+
 async function constructMessages(
   novel: NovelWithChapters,
   request: MinimalTranslationRequest,
@@ -214,38 +240,18 @@ async function constructMessages(
   messages: ChatMessage[];
   tokenCounts: { system: number; task: number; translation: number };
 }> {
-  // Format references with titles
-  const referencesText =
-    novel.references.length > 0
-      ? "Here are references to use to assist in translation. Use them to help with the translation, but don't mention them in the translation:\n" +
-        novel.references
-          .map(
-            (ref: Reference) =>
-              `<ref id="${ref.id}" title="${ref.title}">\n${ref.content}\n</ref>`,
-          )
-          .join('\n\n')
-      : '';
-
-  // Get previous chapters from the novel object
-  let context: ChatMessage[] = [];
-  if (novel.chapters && novel.chapters.length > 0) {
-    // Filter out the current chapter if it exists
-    // Also filter out chapters with low quality translations
-    const previousChapters = novel.chapters.filter((chapter) => {
-      const isNotCurrentChapter =
-        !request.currentChapterId || chapter.id !== request.currentChapterId;
-      const isGoodTranslation =
-        chapter.qualityCheck && chapter.qualityCheck.score >= 6;
-      return isNotCurrentChapter && isGoodTranslation;
-    });
-
-    // Get the index of the current chapter
-    const currentChapterIndex = request.currentChapterId
-      ? novel.chapters.findIndex(
-          (chapter) => chapter.id === request.currentChapterId,
-        )
-      : novel.chapters.length;
+  const referencesText = await getReferencesText(novel);
+
+  // Only chapters usable as context are loaded: not the current chapter, and
+  // with a good enough latest quality check
+  const { chapters: previousChapters, currentChapterIndex } = await getContextChapters(
+    novel.id,
+    request.currentChapterId,
+    MIN_CONTEXT_QUALITY_SCORE,
+  );
 
+  let context: ChatMessage[] = [];
+  if (previousChapters.length > 0) {
     // Format previous chunks as context
     context = previousChapters
       .map((chapter, index) => ({
@@ -260,21 +266,21 @@ async function constructMessages(
           },
         ],
         originalIndex: index,
+        number: chapter.number,
         // Calculate distance from current chapter, if there is one
         distanceFromCurrent:
           currentChapterIndex !== -1
             ? Math.abs(index - currentChapterIndex)
             : index, // If no current chapter, use index as distance
       }))
-      // Sort by distance from current chapter, with closest chapters at the end
-      .sort((a, b) => {
-        const distanceWeight = 10; // Higher value means distance has more influence
-        const randomFactor = (Math.random() - 0.5) * 0.2; // Small random factor for variety
-        return (
-          (b.distanceFromCurrent - a.distanceFromCurrent) * distanceWeight +
-          randomFactor
-        );
-      })
+      // Sort by distance from current chapter, with closest chapters at the end.
+      // Ties (chapters on either side at the same distance) are broken by
+      // chapter number, with the earlier chapter closer to the end, so the
+      // same request always builds the same messages and can hit the cache.
+      .sort(
+        (a, b) =>
+          b.distanceFromCurrent - a.distanceFromCurrent || b.number - a.number,
+      )
       .flatMap((item) => item.pair);
   }
 
@@ -300,9 +306,7 @@ ${request.qualityFeedback}
 Remember: Your response must contain ONLY the improved translation text.`;
   }
 
-  const translationTemplate =
-    novel.translationTemplate ||
-    'Translate the following text from ${sourceLanguage} to ${targetLanguage}. Make sure to preserve and translate the header.${improvementPrompt}\n\n${sourceContent}';
+  const translationTemplate = novel.translationTemplate || DEFAULT_TRANSLATION_TEMPLATE;
 
   const translationInstruction = translationTemplate
     .replaceAll('${sourceLanguage}', novel.sourceLanguage)
@@ -310,29 +314,7 @@ Remember: Your response must contain ONLY the improved translation text.`;
     .replaceAll('${sourceContent}', request.sourceContent)
     .replaceAll('${improvementPrompt}', improvementPrompt);
 
-  const toolingInstructions = `Formatting instructions for reference updates:
-1) Output ONLY the final translation text first (no tags or code blocks).
-2) If you propose reference changes, append exactly one fenced block afterwards:
-\`\`\`toolcalls
-{"reference_ops": [ /* zero or more ops */ ]}
-\`\`\`
-- Allowed ops: "reference.add", "reference.update".
-- Prefer using existing reference \"id\" for updates; otherwise use exact \"title\".
-- Keep each op concise. Do not include this block if there are no changes.
-- Example:
-\`\`\`toolcalls
-{"reference_ops": [
-  {"type": "reference.add", "title": "John Doe", "content": "John Doe (ジョン・ドゥ) is a character in the story."},
-  {"type": "reference.update", "id": "123", "title": "Jane Doe", "content": "Jane Doe (ジェーン・ドウ) is a character in the story."}
-]}
-\`\`\`
-
-Use references to keep track of information that would be helpful for future translations, such as character names, locations, etc.`;
-
-  // Optionally include tool instructions depending on per-novel or global config
-  const toolCallsEnabled = (serverConfig.modelConfigEnable && (novel.translationToolCallsEnable ?? null) !== null)
-    ? Boolean(novel.translationToolCallsEnable)
-    : serverConfig.translationToolCallsEnable;
+  const toolCallsEnabled = isToolCallsEnabled(novel);
 
   // Create messages for the API call
   const messages: ChatMessage[] = [
@@ -348,7 +330,7 @@ Use references to keep track of information that would be helpful for future tra
     toolCallsEnabled
       ? {
           role: 'user' as const,
-          content: toolingInstructions + '\n\n' + translationInstruction,
+          content: TOOLING_INSTRUCTIONS + '\n\n' + translationInstruction,
         }
       : {
           role: 'user' as const,
@@ -386,11 +368,8 @@ export default async function handler(
       return res.status(400).json({ message: 'Novel ID is required' });
     }
 
-    // Fetch the novel first to get all the metadata
-    const novel = await getNovelById(request.novelId, {
-      start: 0,
-      end: 999999, // Large number to ensure we get all chapters
-    });
+    // Fetch the novel metadata; context chapters are loaded when building messages
+    const novel = await getNovelById(request.novelId);
     if (!novel) {
       return res.status(404).json({ message: 'Novel not found' });
     }
@@ -416,51 +395,116 @@ export default async function handler(
     const streamToClient = !!request.useStreaming;
     const streamFromUpstream = streamToClient || serverConfig.translationUseStreaming;
 
-    if (streamToClient) {
-      // Client wants streaming - pass through the stream directly
+    // Exact-match response cache, keyed by model, temperature and messages
+    const requestKey = getTranslationCacheKey(model, temperature, messages);
+    const cacheKey = isTranslationCacheEnabled(temperature) ? requestKey : null;
+    const cachedTranslation = cacheKey ? getCachedTranslation(cacheKey) : undefined;
+
+    // Semantic cache, reusing a chapter's previous translation when its source
+    // only changed slightly. Skipped when retranslating with feedback, as a
+    // new translation is wanted.
+    const currentChapterId = request.currentChapterId;
+    const useSemanticCache =
+      serverConfig.semanticCacheEnable && !!currentChapterId && !request.useImprovementFeedback;
+    const semanticSettingsHash = useSemanticCache
+      ? getSemanticSettingsHash(model, [
+          String(temperature),
+          novel.systemPrompt,
+          await getReferencesText(novel),
+          novel.translationTemplate || DEFAULT_TRANSLATION_TEMPLATE,
+          String(isToolCallsEnabled(novel)),
+        ])
+      : null;
+    const sourceEmbedding =
+      useSemanticCache && !cachedTranslation ? await embedSource(request.sourceContent) : null;
+    const semanticMatch = currentChapterId && semanticSettingsHash && sourceEmbedding
+      ? findSemanticMatch(currentChapterId, request.sourceContent, semanticSettingsHash, sourceEmbedding)
+      : null;
+
+    const cacheTranslation = (result: CachedTranslation) => {
+      // Only complete translations are worth reusing: not truncated,
+      // safety-blocked or otherwise interrupted responses
+      if (result.finishReason !== 'stop') return;
+      if (typeof result.content !== 'string' || result.content.trim() === '') return;
+      // A failed cache write (e.g. SQLITE_BUSY) must not fail the translation
+      try {
+        if (cacheKey) {
+          setCachedTranslation(cacheKey, result);
+        }
+        if (currentChapterId && semanticSettingsHash && sourceEmbedding) {
+          addSemanticEntry(
+            currentChapterId,
+            request.sourceContent,
+            semanticSettingsHash,
+            sourceEmbedding,
+            result.content,
+          );
+        }
+      } catch (error) {
+        console.error('Failed to cache translation:', error);
+      }
+    };
+
+    // Identical requests in flight at the same time share one upstream call,
+    // so retries and double submits aren't translated (and billed) twice.
+    // Sharing an in-flight result can't serve a stale translation, so this
+    // applies whether or not the response cache is enabled. Only the first
+    // caller stores the result in the caches.
+    const coalesce = <T>(fn: () => Promise<T>): Promise<T> => singleFlight(requestKey, fn);
+
+    const cacheHit: CachedTranslation | null = cachedTranslation
+      ? cachedTranslation
+      : semanticMatch
+        ? { content: semanticMatch.translation, usage: undefined, finishReason: 'stop' }
+        : null;
+
+    if (streamToClient && cacheHit) {
+      // Replay the cached translation to the streaming client as a single chunk
+      console.log('translation response (streamed, cache hit)', {
+        semanticSimilarity: semanticMatch?.similarity,
+        contentLength: cacheHit.content.length,
+      });
+      res.writeHead(200, {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+      });
+      res.write(`data: ${JSON.stringify({
+        type: 'metadata',
+        sourceLanguage: novel.sourceLanguage,
+        targetLanguage: novel.targetLanguage,
+        tokenCounts,
+        postprocessOptions,
+      })}\n\n`);
+      res.write(`data: ${JSON.stringify({
+        choices: [{ index: 0, delta: { content: cacheHit.content }, finish_reason: cacheHit.finishReason }],
+        usage: cacheHit.usage,
+      })}\n\n`);
+      res.write('data: [DONE]\n\n');
+      return res.end();
+    } else if (streamToClient) {
+      // Client wants streaming - pass through the stream directly, while
+      // accumulating it so the finished translation can be cached
+      const abortController = new AbortController();
+      let upstreamFinished = false;
+      res.on('close', () => {
+        // Stop generating (and paying for) tokens nobody will read
+        if (!upstreamFinished) {
+          abortController.abort();
+        }
+      });
+
       try {
-        const response = await axios.post(
+        const response = await llmClient.post(
           url,
-          {
-            model,
-            messages,
-            temperature,
-            max_tokens: maxOutputTokens,
-            stream: true,
-            stream_options: { include_usage: true },
-            ...(model.includes('gemini')
-              ? {
-                  safetySettings: [
-                    {
-                      category: 'HARM_CATEGORY_HARASSMENT',
-                      threshold: 'BLOCK_NONE',
-                    },
-                    {
-                      category: 'HARM_CATEGORY_HATE_SPEECH',
-                      threshold: 'BLOCK_NONE',
-                    },
-                    {
-                      category: 'HARM_CATEGORY_SEXUALLY_EXPLICIT',
-                      threshold: 'BLOCK_NONE',
-                    },
-                    {
-                      category: 'HARM_CATEGORY_DANGEROUS_CONTENT',
-                      threshold: 'BLOCK_NONE',
-                    },
-                    {
-                      category: 'HARM_CATEGORY_CIVIC_INTEGRITY',
-                      threshold: 'BLOCK_NONE',
-                    },
-                  ],
-                }
-              : {}),
-          },
+          buildCompletionPayload(model, messages, temperature, maxOutputTokens, { stream: true }),
           {
             headers: {
               'Content-Type': 'application/json',
               Authorization: `Bearer ${apiKey}`,
             },
             responseType: 'stream',
+            signal: abortController.signal,
           },
         );
 
@@ -481,21 +525,39 @@ export default async function handler(
           postprocessOptions,
         })}\n\n`);
 
+        const accumulator = createStreamAccumulator();
+
         stream.on('data', (chunk: Buffer) => {
+          accumulator.push(chunk);
           res.write(chunk);
         });
 
         stream.on('end', () => {
-          res.end();
+          upstreamFinished = true;
+          try {
+            const { content, usage, finishReason, doneSeen } = accumulator.finish();
+            if (doneSeen) {
+              cacheTranslation({ content, usage, finishReason });
+            }
+          } finally {
+            res.end();
+          }
         });
 
         stream.on('error', (err) => {
+          upstreamFinished = true;
+          if (abortController.signal.aborted) {
+            return;
+          }
           console.error('Stream error:', err);
           res.write(`data: ${JSON.stringify({ error: 'Stream error' })}\n\n`);
           res.end();
         });
 
       } catch (error) {
+        if (abortController.signal.aborted) {
+          return res.end();
+        }
         console.error('Streaming request failed:', error);
         if (!res.headersSent) {
           const status = axios.isAxiosError(error)
@@ -505,18 +567,42 @@ export default async function handler(
         }
         return res.end();
       }
+    } else if (cacheHit) {
+      console.log('translation response (cache hit)', {
+        semanticSimilarity: semanticMatch?.similarity,
+        usage: cacheHit.usage,
+        finishReason: cacheHit.finishReason,
+        contentLength: cacheHit.content.length,
+      });
+      return res.status(200).json(
+        buildTranslationResponse(
+          novel,
+          cacheHit.content,
+          cacheHit.usage,
+          cacheHit.finishReason,
+          tokenCounts,
+        ),
+      );
     } else if (streamFromUpstream) {
       // Server wants to stream from upstream but client doesn't want streaming
       // Collect the streamed response and return as JSON
       try {
-        const streamResult = await makeStreamingTranslationRequest(
-          url,
-          messages,
-          model,
-          temperature,
-          apiKey,
-          maxOutputTokens,
-        );
+        const streamResult = await coalesce(async () => {
+          const result = await makeStreamingTranslationRequest(
+            url,
+            messages,
+            model,
+            temperature,
+            apiKey,
+            maxOutputTokens,
+          );
+          cacheTranslation({
+            content: result.content,
+            usage: result.usage,
+            finishReason: result.finishReason,
+          });
+          return result;
+        });
 
         const translation = streamResult.content;
         const tokenUsage = streamResult.usage;
@@ -527,44 +613,17 @@ export default async function handler(
           contentLength: translation.length,
         });
 
-        // Extract toolcalls, then post-process translation text
-        const { translation: strippedTranslation, toolcalls } = extractToolcallsAndStrip(translation);
-        const normalizedToolCalls = normalizeToolCalls(toolcalls);
-        const postProcessedTranslation = postProcessTranslation(strippedTranslation, postprocessOptions);
-
-        // Return the translation along with the novel's language settings for quality check
-        return res.status(200).json({
-          translation: postProcessedTranslation,
-          toolCalls: normalizedToolCalls,
-          tokenUsage: tokenUsage || { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 },
-          sourceLanguage: novel.sourceLanguage,
-          targetLanguage: novel.targetLanguage,
-          tokenCounts: {
-            system: tokenCounts.system,
-            task: tokenCounts.task,
-            translation: tokenCounts.translation,
-          },
-          finishReason,
-        });
-
+        return res.status(200).json(
+          buildTranslationResponse(novel, translation, tokenUsage, finishReason, tokenCounts),
+        );
       } catch (error) {
         console.error('Streaming request failed:', error);
         return res.status(500).json({ message: 'Streaming request failed' });
       }
     } else {
       // Non-streaming from upstream
-      let apiResponse = await makeTranslationRequest(
-        url,
-        messages,
-        model,
-        temperature,
-        apiKey,
-        maxOutputTokens,
-      );
-
-      if (apiResponse.data.choices[0].finish_reason === 'length') {
-        console.log('Hit length limit, retrying with the same parameters...');
-        apiResponse = await makeTranslationRequest(
+      const apiResponse = await coalesce(async () => {
+        let response = await makeTranslationRequest(
           url,
           messages,
           model,
@@ -572,38 +631,43 @@ export default async function handler(
           apiKey,
           maxOutputTokens,
         );
-      }
+
+        if (response.data.choices[0].finish_reason === 'length') {
+          console.log('Hit length limit, retrying with the same parameters...');
+          response = await makeTranslationRequest(
+            url,
+            messages,
+            model,
+            temperature,
+            apiKey,
+            maxOutputTokens,
+          );
+        }
+
+        cacheTranslation({
+          content: response.data.choices[0].message.content,
+          usage: response.data.usage,
+          finishReason: response.data.choices[0].finish_reason,
+        });
+        return response;
+      });
 
       const translation = apiResponse.data.choices[0].message.content;
       const tokenUsage = apiResponse.data.usage;
       const finishReason = apiResponse.data.choices[0].finish_reason;
+      // Log a summary rather than the whole response; inspecting the full
+      // body (and headers) of every translation is costly on the request path
       console.log('translation response', {
-        responseHeaders: apiResponse.headers,
-        responseBody: apiResponse.data,
+        id: apiResponse.data.id,
+        contentLength: translation?.length ?? 0,
         usage: tokenUsage,
         finishReason,
         safetyResults: JSON.stringify(apiResponse.data.vertex_ai_safety_results),
       });
 
-      // Extract toolcalls, then post-process translation text
-      const { translation: strippedTranslation, toolcalls } = extractToolcallsAndStrip(translation);
-      const normalizedToolCalls = normalizeToolCalls(toolcalls);
-      const postProcessedTranslation = postProcessTranslation(strippedTranslation, postprocessOptions);
-
-      // Return the translation along with the novel's language settings for quality check
-      return res.status(200).json({
-        translation: postProcessedTranslation,
-        toolCalls: normalizedToolCalls,
-        tokenUsage: tokenUsage || { prompt_tokens: 0, completion_tokens: 0, total_tokens: 0 },
-        sourceLanguage: novel.sourceLanguage,
-        targetLanguage: novel.targetLanguage,
-        tokenCounts: {
-          system: tokenCounts.system,
-          task: tokenCounts.task,
-          translation: tokenCounts.translation,
-        },
-        finishReason,
-      });
+      return res.status(200).json(
+        buildTranslationResponse(novel, translation, tokenUsage, finishReason, tokenCounts),
+      );
     }
   } catch (error: unknown) {
     if (axios.isAxiosError(error)) {
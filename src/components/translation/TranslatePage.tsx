@@ -293,6 +293,8 @@ async function scrapeChapter(novelUrl: string, chapterNumber: number) {
 
 const LOCAL_STORAGE_KEY = 'novelLamaAppearanceSettings';
 
+const READING_PROGRESS_DEBOUNCE_MS = 500;
+
 // Utility to safely get settings from localStorage
 const loadAppearanceSettings = (): AppearanceSettings => {
   if (typeof window === 'undefined') {
@@ -463,6 +465,71 @@ export default function TranslatePage({
     [setNovel],
   );
 
+  // Reading progress while navigating is persisted after a short delay, so
+  // paging quickly through chapters (or batch translating) collapses into a
+  // single write for the chapter the reader ends up on.
+  const pendingReadingProgressRef = useRef<{ novelId: string; chapterNumber: number } | null>(null);
+  const readingProgressTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+
+  const cancelReadingProgress = useCallback(() => {
+    if (readingProgressTimerRef.current) {
+      clearTimeout(readingProgressTimerRef.current);
+      readingProgressTimerRef.current = null;
+    }
+    pendingReadingProgressRef.current = null;
+  }, []);
+
+  const flushReadingProgress = useCallback(() => {
+    if (readingProgressTimerRef.current) {
+      clearTimeout(readingProgressTimerRef.current);
+      readingProgressTimerRef.current = null;
+    }
+    const pending = pendingReadingProgressRef.current;
+    pendingReadingProgressRef.current = null;
+    if (pending) {
+      void syncReadingProgress(pending.novelId, pending.chapterNumber);
+    }
+  }, [syncReadingProgress]);
+
+  const scheduleReadingProgress = useCallback(
+    (novelId: string, chapterNumber: number) => {
+      pendingReadingProgressRef.current = { novelId, chapterNumber };
+      if (readingProgressTimerRef.current) {
+        clearTimeout(readingProgressTimerRef.current);
+      }
+      readingProgressTimerRef.current = setTimeout(
+        flushReadingProgress,
+        READING_PROGRESS_DEBOUNCE_MS,
+      );
+    },
+    [flushReadingProgress],
+  );
+
+  useEffect(() => {
+    // Persist any pending progress when the page is hidden or closed; a
+    // keepalive request survives the page being unloaded
+    const handlePageHide = () => {
+      const pending = pendingReadingProgressRef.current;
+      if (!pending) return;
+      pendingReadingProgressRef.current = null;
+      void fetch(`/api/novels/${pending.novelId}/progress`, {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ readingChapterNumber: pending.chapterNumber }),
+        keepalive: true,
+      }).catch((error) => {
+        console.error('Failed to sync reading progress:', error);
+      });
+    };
+
+    window.addEventListener('pagehide', handlePageHide);
+    return () => {
+      window.removeEventListener('pagehide', handlePageHide);
+      // Leaving the page within the app: write whatever is still pending
+      flushReadingProgress();
+    };
+  }, [flushReadingProgress]);
+
   useEffect(() => {
     if (!initialNovel?.id) {
       return;
@@ -1091,7 +1158,11 @@ export default function TranslatePage({
       setCurrentChapterNumber(chapterNumber);
 
       if (novel.readingChapterNumber !== chapterNumber) {
-        void syncReadingProgress(novel.id, chapterNumber);
+        scheduleReadingProgress(novel.id, chapterNumber);
+      } else {
+        // Back on the saved chapter: a write still pending for another
+        // chapter would now save the wrong position
+        cancelReadingProgress();
       }
 
       // Scroll to top after navigation completes
@@ -0,0 +1,173 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import type { AxiosResponse } from 'axios';
+import { Novel } from '@/types';
+
+vi.mock('./llmClient', async (importOriginal) => ({
+  ...(await importOriginal<typeof import('./llmClient')>()),
+  llmClient: { post: vi.fn() },
+}));
+
+import { llmClient } from './llmClient';
+import {
+  MAX_BATCH_SIZE,
+  MAX_CONCURRENT_BATCHES,
+  translateBatch,
+  translateTexts,
+} from './batchTranslate';
+
+const post = vi.mocked(llmClient.post);
+
+const novel = {
+  id: 'novel-1',
+  systemPrompt: 'You are a translator.',
+  sourceLanguage: 'Japanese',
+  targetLanguage: 'English',
+  references: [],
+} as unknown as Novel;
+
+function completion(content: string) {
+  return { data: { choices: [{ message: { content } }] } } as AxiosResponse;
+}
+
+// Texts sent in a request, from its numbered lines
+function requestedTexts(body: unknown): string[] {
+  const { messages } = body as { messages: { content: string }[] };
+  return messages[messages.length - 1].content
+    .split('\n')
+    .flatMap((line) => line.match(/^\d+\. (.*)$/)?.slice(1) ?? []);
+}
+
+// Answer every numbered line with its text, prefixed
+function echoWith(prefix: string) {
+  return async (_url: string, body: unknown) =>
+    completion(requestedTexts(body).map((text, i) => `${i + 1}. ${prefix}${text}`).join('\n'));
+}
+
+describe('translateBatch', () => {
+  beforeEach(() => {
+    post.mockReset();
+    vi.spyOn(console, 'warn').mockImplementation(() => {});
+  });
+
+  it('should translate all texts in a single completion', async () => {
+    post.mockImplementation(echoWith('EN '));
+
+    await expect(translateBatch(novel, ['一', '二', '三'])).resolves.toEqual([
+      'EN 一',
+      'EN 二',
+      'EN 三',
+    ]);
+    expect(post).toHaveBeenCalledTimes(1);
+  });
+
+  it('should include the novel references in the prompt', async () => {
+    post.mockImplementation(echoWith('EN '));
+    const novelWithReferences = {
+      ...novel,
+      id: 'novel-with-references',
+      references: [{ id: 'ref-1', title: 'Taro', content: 'Taro (太郎) is the hero.', updatedAt: 1 }],
+    } as unknown as Novel;
+
+    await translateBatch(novelWithReferences, ['太郎']);
+
+    const { messages } = post.mock.calls[0][1] as { messages: { content: string }[] };
+    expect(messages.some((message) => message.content.includes('Taro (太郎) is the hero.'))).toBe(true);
+  });
+
+  it('should fall back to single translations when the reply cannot be parsed', async () => {
+    post
+      .mockResolvedValueOnce(completion('1. EN 一'))
+      .mockResolvedValueOnce(completion('1. EN 一'))
+      .mockResolvedValueOnce(completion('EN 二'));
+
+    await expect(translateBatch(novel, ['一', '二'])).resolves.toEqual(['EN 一', 'EN 二']);
+    expect(post).toHaveBeenCalledTimes(3);
+  });
+
+  it('should map empty texts back without sending them', async () => {
+    post.mockImplementation(echoWith('EN '));
+
+    await expect(translateBatch(novel, ['一', '', '  ', '二'])).resolves.toEqual([
+      'EN 一',
+      '',
+      '',
+      'EN 二',
+    ]);
+    expect(requestedTexts(post.mock.calls[0][1])).toEqual(['一', '二']);
+  });
+
+  it('should not call the API when every text is empty', async () => {
+    await expect(translateBatch(novel, ['', ' '])).resolves.toEqual(['', '']);
+    expect(post).not.toHaveBeenCalled();
+  });
+});
+
+describe('translateTexts', () => {
+  beforeEach(() => {
+    post.mockReset();
+  });
+
+  it('should keep input order when batches finish out of order', async () => {
+    const texts = Array.from({ length: MAX_BATCH_SIZE * 3 }, (_, i) => `text ${i}`);
+    let delay = 30;
+    post.mockImplementation(async (url, body) => {
+      // Earlier batches take longer than later ones
+      await new Promise((resolve) => setTimeout(resolve, (delay -= 10)));
+      return echoWith('EN ')(url, body);
+    });
+
+    await expect(translateTexts(novel, texts)).resolves.toEqual(texts.map((text) => `EN ${text}`));
+    expect(post).toHaveBeenCalledTimes(3);
+  });
+
+  it('should run at most MAX_CONCURRENT_BATCHES completions at once', async () => {
+    const batchCount = MAX_CONCURRENT_BATCHES * 2 + 1;
+    const texts = Array.from({ length: MAX_BATCH_SIZE * batchCount }, (_, i) => `${i}`);
+    let running = 0;
+    let maxRunning = 0;
+    post.mockImplementation(async (url, body) => {
+      running += 1;
+      maxRunning = Math.max(maxRunning, running);
+      await new Promise((resolve) => setTimeout(resolve, 5));
+      running -= 1;
+      return echoWith('')(url, body);
+    });
+
+    await expect(translateTexts(novel, texts)).resolves.toEqual(texts);
+    expect(maxRunning).toBe(MAX_CONCURRENT_BATCHES);
+  });
+
+  it('should share the concurrency limit between concurrent calls', async () => {
+    const texts = Array.from({ length: MAX_BATCH_SIZE * MAX_CONCURRENT_BATCHES }, (_, i) => `${i}`);
+    let running = 0;
+    let maxRunning = 0;
+    post.mockImplementation(async (url, body) => {
+      running += 1;
+      maxRunning = Math.max(maxRunning, running);
+      await new Promise((resolve) => setTimeout(resolve, 5));
+      running -= 1;
+      return echoWith('')(url, body);
+    });
+
+    const results = await Promise.all([translateTexts(novel, texts), translateTexts(novel, texts)]);
+
+    expect(results).toEqual([texts, texts]);
+    expect(maxRunning).toBe(MAX_CONCURRENT_BATCHES);
+    expect(post).toHaveBeenCalledTimes(MAX_CONCURRENT_BATCHES * 2);
+  });
+
+  it('should fail when any batch fails, without starting further batches', async () => {
+    const texts = Array.from({ length: MAX_BATCH_SIZE * MAX_CONCURRENT_BATCHES * 2 }, (_, i) => `${i}`);
+    post
+      .mockRejectedValueOnce(new Error('Request failed with status code 500'))
+      .mockImplementation(async (url, body) => {
+        await new Promise((resolve) => setTimeout(resolve, 5));
+        return echoWith('')(url, body);
+      });
+
+    await expect(translateTexts(novel, texts)).rejects.toThrow('Request failed with status code 500');
+    // Let the batches still in flight finish
+    await new Promise((resolve) => setTimeout(resolve, 20));
+    expect(post).toHaveBeenCalledTimes(MAX_CONCURRENT_BATCHES);
+  });
+});
@@ -0,0 +1,171 @@
+import { Novel } from '@/types';
+import { buildCompletionPayload, llmClient } from './llmClient';
+import { formatNumberedLines, parseNumberedLines } from './numberedLines';
+import { postProcessTranslation } from './postProcessTranslation';
+import { getReferencesText, postprocessOptions } from './translationPrompt';
+import { serverConfig } from '../../config';
+
+// Maximum number of texts sent together in a single completion
+export const MAX_BATCH_SIZE = 16;
+
+// Maximum number of texts accepted in a single batch translation request
+export const MAX_TEXTS_PER_REQUEST = 512;
+
+// Maximum number of batch completions running concurrently across all
+// requests in this process, to stay well within typical rate limits
+export const MAX_CONCURRENT_BATCHES = 8;
+
+let activeBatches = 0;
+const waitingBatches: Array<() => void> = [];
+
+// Run fn once one of the MAX_CONCURRENT_BATCHES slots is free, in FIFO order
+async function withBatchSlot<T>(fn: () => Promise<T>): Promise<T> {
+  if (activeBatches < MAX_CONCURRENT_BATCHES) {
+    activeBatches += 1;
+  } else {
+    // The slot is handed over directly by the batch that frees it
+    await new Promise<void>((resolve) => waitingBatches.push(resolve));
+  }
+  try {
+    return await fn();
+  } finally {
+    const next = waitingBatches.shift();
+    if (next) {
+      next();
+    } else {
+      activeBatches -= 1;
+    }
+  }
+}
+
+interface ChatMessage {
+  role: 'system' | 'user' | 'assistant';
+  content: string;
+}
+
+// Same system prompt and references as single translations, so names and
+// terms are translated consistently
+function buildBatchMessages(novel: Novel, referencesText: string, texts: string[]): ChatMessage[] {
+  return [
+    {
+      role: 'system',
+      content: `${novel.systemPrompt}`,
+    },
+    ...(referencesText ? [{ role: 'user' as const, content: referencesText }] : []),
+    {
+      role: 'user',
+      content: `Translate each numbered line from ${novel.sourceLanguage} to ${novel.targetLanguage}.
+Preserve the numbering: respond with exactly one line per input line, in the form "<number>. <translation>", and nothing else.
+
+${formatNumberedLines(texts)}`,
+    },
+  ];
+}
+
+async function requestCompletion(novel: Novel, messages: ChatMessage[]): Promise<string> {
+  const model = serverConfig.modelConfigEnable && novel.translationModel
+    ? novel.translationModel
+    : serverConfig.translationModel;
+  const maxOutputTokens = serverConfig.modelConfigEnable && (novel.maxTranslationOutputTokens ?? undefined)
+    ? (novel.maxTranslationOutputTokens as number)
+    : serverConfig.maxTranslationOutputTokens;
+
+  const response = await llmClient.post(
+    `${serverConfig.openaiBaseUrl}/chat/completions`,
+    buildCompletionPayload(model, messages, serverConfig.translationTemperature, maxOutputTokens),
+    {
+      headers: {
+        Authorization: `Bearer ${serverConfig.openaiApiKey}`,
+      },
+    },
+  );
+
+  return response.data.choices[0].message.content ?? '';
+}
+
+// Translate only the texts with content, mapping empty (or whitespace only)
+// texts to '' instead of asking the model to translate nothing
+async function translateNonEmpty(
+  texts: string[],
+  translate: (nonEmptyTexts: string[]) => Promise<string[]>,
+): Promise<string[]> {
+  const indexes = texts.flatMap((text, i) => (text.trim() ? [i] : []));
+  const results = texts.map(() => '');
+  if (indexes.length === 0) return results;
+
+  const translated = await translate(indexes.map((i) => texts[i]));
+  indexes.forEach((textIndex, i) => {
+    results[textIndex] = translated[i];
+  });
+  return results;
+}
+
+// Translate a single batch (at most MAX_BATCH_SIZE texts) in one completion.
+// If the reply can't be mapped back onto the inputs, translate each text on its own.
+export function translateBatch(novel: Novel, texts: string[]): Promise<string[]> {
+  return translateNonEmpty(texts, async (batch) => {
+    const translations = await translateNumberedLines(novel, await getReferencesText(novel), batch);
+    return translations.map((translation) => postProcessTranslation(translation, postprocessOptions));
+  });
+}
+
+async function translateNumberedLines(
+  novel: Novel,
+  referencesText: string,
+  texts: string[],
+): Promise<string[]> {
+  const content = await requestCompletion(novel, buildBatchMessages(novel, referencesText, texts));
+  const parsed = parseNumberedLines(content, texts.length);
+  if (parsed) {
+    return parsed;
+  }
+
+  console.warn(
+    `Failed to parse numbered batch translation (${texts.length} texts), falling back to single translations`,
+  );
+  const results: string[] = [];
+  for (const text of texts) {
+    const single = await requestCompletion(novel, buildBatchMessages(novel, referencesText, [text]));
+    results.push(parseNumberedLines(single, 1)?.[0] ?? single.trim());
+  }
+  return results;
+}
+
+// Translate any number of texts, MAX_BATCH_SIZE texts per completion, with
+// up to MAX_CONCURRENT_BATCHES completions in flight at once (shared with
+// any other calls running at the same time).
+export function translateTexts(novel: Novel, texts: string[]): Promise<string[]> {
+  return translateNonEmpty(texts, (nonEmptyTexts) => translateInBatches(novel, nonEmptyTexts));
+}
+
+async function translateInBatches(novel: Novel, texts: string[]): Promise<string[]> {
+  const batches: string[][] = [];
+  for (let i = 0; i < texts.length; i += MAX_BATCH_SIZE) {
+    batches.push(texts.slice(i, i + MAX_BATCH_SIZE));
+  }
+
+  const results: string[][] = new Array(batches.length);
+  let nextBatch = 0;
+  let failed = false;
+  const worker = async () => {
+    // After a failure the whole call fails, so don't start further batches
+    while (!failed && nextBatch < batches.length) {
+      const index = nextBatch++;
+      try {
+        // Another batch may have failed while this one waited for a slot
+        results[index] = await withBatchSlot(async () =>
+          failed ? [] : translateBatch(novel, batches[index]),
+        );
+      } catch (error) {
+        failed = true;
+        throw error;
+      }
+    }
+  };
+  await Promise.all(
+    Array.from({ length: Math.min(MAX_CONCURRENT_BATCHES, batches.length) }, worker),
+  );
+
+  // Batches finish in any order, but results are kept in input order
+  return results.flat();
+}
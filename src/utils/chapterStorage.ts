@@ -2,122 +2,167 @@ import { TranslationChapter } from '@/types';
 import getDb from './db';
 import { nanoid } from 'nanoid';
 
-// Save a single chapter
-export async function saveChapter(
-  novelId: string,
-  chapter: TranslationChapter,
-): Promise<void> {
-  const db = getDb();
-  const now = Date.now();
+type Db = ReturnType<typeof getDb>;
 
-  // Start transaction
-  const transaction = db.transaction(() => {
-    // First check if the novel exists
-    const novel = db.prepare(`SELECT id FROM novels WHERE id = ?`).get(novelId);
+function assertNovelExists(db: Db, novelId: string) {
+  const novel = db.prepare(`SELECT id FROM novels WHERE id = ?`).get(novelId);
 
-    if (!novel) {
-      throw new Error(`Novel with ID ${novelId} not found`);
-    }
+  if (!novel) {
+    throw new Error(`Novel with ID ${novelId} not found`);
+  }
+}
 
-    // Generate or use existing chapter ID
-    const chapterId = chapter.id || nanoid();
+// Insert or update a chapter, its quality check and a revision snapshot.
+// Must be called inside a transaction.
+function upsertChapter(
+  db: Db,
+  novelId: string,
+  chapter: TranslationChapter,
+  now: number,
+) {
+  // Generate or use existing chapter ID
+  const chapterId = chapter.id || nanoid();
 
-    // First, insert or update the chapter and get the result
-    const chapterResult = db
-      .prepare(
-        `
-      INSERT INTO chapters (
-        id, novelId, number, title,
-        sourceContent, translatedContent,
-        createdAt, updatedAt
-      ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-      ON CONFLICT(novelId, number) DO UPDATE SET
-        id = excluded.id,
-        title = excluded.title,
-        sourceContent = excluded.sourceContent,
-        translatedContent = excluded.translatedContent,
-        updatedAt = excluded.updatedAt
-      RETURNING id
-    `,
-      )
-      .get(
-        chapterId,
-        novelId,
-        chapter.number,
-        chapter.title,
-        chapter.sourceContent,
-        chapter.translatedContent,
-        chapter.createdAt || now,
-        now,
-      ) as { id: string };
-
-    // If there's a quality check, save it using the confirmed chapter ID
-    if (chapter.qualityCheck) {
-      // First delete any existing quality checks for this chapter
-      db.prepare(`DELETE FROM quality_checks WHERE chapterId = ?`).run(
-        chapterResult.id,
-      );
-
-      // Then insert the new quality check
-      db.prepare(
-        `
-        INSERT INTO quality_checks (
-          chapterId, score, feedback,
-          isGoodQuality, createdAt
-        ) VALUES (?, ?, ?, ?, ?)
-      `,
-      ).run(
-        chapterResult.id,
-        chapter.qualityCheck.score,
-        chapter.qualityCheck.feedback,
-        chapter.qualityCheck.isGoodQuality ? 1 : 0,
-        now,
-      );
-    }
+  // First, insert or update the chapter and get the result
+  const chapterResult = db
+    .prepare(
+      `
+    INSERT INTO chapters (
+      id, novelId, number, title,
+      sourceContent, translatedContent,
+      createdAt, updatedAt
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(novelId, number) DO UPDATE SET
+      id = excluded.id,
+      title = excluded.title,
+      sourceContent = excluded.sourceContent,
+      translatedContent = excluded.translatedContent,
+      updatedAt = excluded.updatedAt
+    RETURNING id
+  `,
+    )
+    .get(
+      chapterId,
+      novelId,
+      chapter.number,
+      chapter.title,
+      chapter.sourceContent,
+      chapter.translatedContent,
+      chapter.createdAt || now,
+      now,
+    ) as { id: string };
+
+  // If there's a quality check, save it using the confirmed chapter ID
+  if (chapter.qualityCheck) {
+    // First delete any existing quality checks for this chapter
+    db.prepare(`DELETE FROM quality_checks WHERE chapterId = ?`).run(
+      chapterResult.id,
+    );
 
-    // Always record a revision snapshot of the chapter after save/update
-    const revisionId = nanoid();
+    // Then insert the new quality check
     db.prepare(
       `
-      INSERT INTO chapter_revisions (
-        id, chapterId, title, sourceContent, translatedContent,
-        qualityScore, qualityFeedback, qualityIsGood, createdAt
-      ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+      INSERT INTO quality_checks (
+        chapterId, score, feedback,
+        isGoodQuality, createdAt
+      ) VALUES (?, ?, ?, ?, ?)
     `,
     ).run(
-      revisionId,
       chapterResult.id,
-      chapter.title,
-      chapter.sourceContent,
-      chapter.translatedContent,
-      chapter.qualityCheck?.score ?? null,
-      chapter.qualityCheck?.feedback ?? null,
-      chapter.qualityCheck ? (chapter.qualityCheck.isGoodQuality ? 1 : 0) : 0,
+      chapter.qualityCheck.score,
+      chapter.qualityCheck.feedback,
+      chapter.qualityCheck.isGoodQuality ? 1 : 0,
       now,
     );
+  }
 
-    // Update novel's chapter count
-    const chapterCount = db
-      .prepare(
-        `
-      SELECT COUNT(*) as count FROM chapters WHERE novelId = ?
-    `,
-      )
-      .get(novelId) as { count: number };
+  // Always record a revision snapshot of the chapter after save/update
+  const revisionId = nanoid();
+  db.prepare(
+    `
+    INSERT INTO chapter_revisions (
+      id, chapterId, title, sourceContent, translatedContent,
+      qualityScore, qualityFeedback, qualityIsGood, createdAt
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+  `,
+  ).run(
+    revisionId,
+    chapterResult.id,
+    chapter.title,
+    chapter.sourceContent,
+    chapter.translatedContent,
+    chapter.qualityCheck?.score ?? null,
+    chapter.qualityCheck?.feedback ?? null,
+    chapter.qualityCheck ? (chapter.qualityCheck.isGoodQuality ? 1 : 0) : 0,
+    now,
+  );
+}
 
-    db.prepare(
+// Must be called inside a transaction.
+function updateChapterCount(db: Db, novelId: string, now: number) {
+  // Update novel's chapter count
+  const chapterCount = db
+    .prepare(
       `
-      UPDATE novels 
-      SET chapterCount = ?, updatedAt = ?
-      WHERE id = ?
-    `,
-    ).run(chapterCount.count, now, novelId);
+    SELECT COUNT(*) as count FROM chapters WHERE novelId = ?
+  `,
+    )
+    .get(novelId) as { count: number };
+
+  db.prepare(
+    `
+    UPDATE novels 
+    SET chapterCount = ?, updatedAt = ?
+    WHERE id = ?
+  `,
+  ).run(chapterCount.count, now, novelId);
+}
+
+// Save a single chapter
+export async function saveChapter(
+  novelId: string,
+  chapter: TranslationChapter,
+): Promise<void> {
+  const db = getDb();
+  const now = Date.now();
+
+  // Start transaction
+  const transaction = db.transaction(() => {
+    // First check if the novel exists
+    assertNovelExists(db, novelId);
+    upsertChapter(db, novelId, chapter, now);
+    updateChapterCount(db, novelId, now);
   });
 
   // Execute transaction
   transaction();
 }
 
+// Save many chapters in a single transaction, so an import either lands
+// completely or not at all, and commits (and syncs the WAL) only once.
+// With `replace`, existing chapters are deleted first in the same transaction.
+export async function saveChapters(
+  novelId: string,
+  chapters: TranslationChapter[],
+  options: { replace?: boolean } = {},
+): Promise<void> {
+  const db = getDb();
+  const now = Date.now();
+
+  const transaction = db.transaction(() => {
+    assertNovelExists(db, novelId);
+    if (options.replace) {
+      db.prepare(`DELETE FROM chapters WHERE novelId = ?`).run(novelId);
+    }
+    for (const chapter of chapters) {
+      upsertChapter(db, novelId, chapter, now);
+    }
+    updateChapterCount(db, novelId, now);
+  });
+
+  transaction();
+}
+
 // Get a single chapter
 export async function getChapter(
   novelId: string,
@@ -182,19 +227,18 @@ export async function getChapters(
     )
     .all(novelId, startNumber, endNumber) as TranslationChapter[];
 
-  // Get quality checks for each chapter
-  for (const chapter of chapters) {
-    const qualityCheck = db
-      .prepare(
-        `
+  // Get quality checks for each chapter, compiling the statement only once
+  const latestQualityCheck = db.prepare(
+    `
       SELECT score, feedback, isGoodQuality
       FROM quality_checks 
       WHERE chapterId = ?
       ORDER BY createdAt DESC
       LIMIT 1
     `,
-      )
-      .get(chapter.id) as
+  );
+  for (const chapter of chapters) {
+    const qualityCheck = latestQualityCheck.get(chapter.id) as
       | { score: number; feedback: string; isGoodQuality: number }
       | undefined;
 
@@ -344,14 +388,6 @@ export async function deleteChapter(
   transaction();
 }
 
-// Delete all chapters for a novel
-export async function deleteNovelChapters(novelId: string): Promise<void> {
-  const db = getDb();
-
-  // Delete all chapters (quality checks will be deleted by foreign key constraint)
-  db.prepare(`DELETE FROM chapters WHERE novelId = ?`).run(novelId);
-}
-
 // List all chapters for a novel
 export async function listChapters(novelId: string): Promise<number[]> {
   const db = getDb();
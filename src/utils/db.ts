@@ -27,8 +27,11 @@ function initializeDb() {
   // Improve concurrency and reduce lock contention
   // - WAL allows concurrent readers during writes
   // - busy_timeout makes readers wait for a short period instead of failing immediately
+  // - synchronous = NORMAL only fsyncs at WAL checkpoints, which is still
+  //   safe against corruption in WAL mode and much cheaper per commit
   db.exec('PRAGMA journal_mode = WAL');
   db.exec('PRAGMA busy_timeout = 5000');
+  db.exec('PRAGMA synchronous = NORMAL');
 
   // Create novels table
   db.exec(`
@@ -147,6 +150,13 @@ function initializeDb() {
     )
   `);
 
+  // Index for looking up the latest quality check of a chapter, used by every
+  // chapter read (and by the translate endpoint for all previous chapters)
+  db.exec(`
+    CREATE INDEX IF NOT EXISTS idx_quality_checks_chapterId_createdAt
+    ON quality_checks (chapterId, createdAt)
+  `);
+
   // Create chapter_revisions table to track historical changes to chapters
   db.exec(`
     CREATE TABLE IF NOT EXISTS chapter_revisions (
@@ -169,6 +179,37 @@ function initializeDb() {
     ON chapter_revisions (chapterId, createdAt)
   `);
 
+  // Create semantic_cache table holding the source embedding of each
+  // chapter's latest translation
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS semantic_cache (
+      chapterId TEXT PRIMARY KEY,
+      sourceHash TEXT NOT NULL,
+      settingsHash TEXT NOT NULL,
+      sourceLength INTEGER NOT NULL,
+      embedding BLOB NOT NULL,
+      translation TEXT NOT NULL,
+      updatedAt INTEGER NOT NULL,
+      FOREIGN KEY (chapterId) REFERENCES chapters(id) ON DELETE CASCADE
+    )
+  `);
+
+  // Create translation_cache table backing the exact-match response cache
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS translation_cache (
+      key TEXT PRIMARY KEY,
+      content TEXT NOT NULL,
+      usage TEXT,
+      finishReason TEXT,
+      expiresAt INTEGER NOT NULL
+    )
+  `);
+
+  db.exec(`
+    CREATE INDEX IF NOT EXISTS idx_translation_cache_expiresAt
+    ON translation_cache (expiresAt)
+  `);
+
   // Enable foreign key support
   db.exec('PRAGMA foreign_keys = ON');
 }
@@ -52,6 +52,54 @@ export async function readNovels(): Promise<Novel[]> {
   return processedNovels;
 }
 
+// Joins each chapter with its most recent quality check
+const LATEST_QUALITY_CHECK_JOIN = `
+    LEFT JOIN (
+      SELECT chapterId, score, feedback, isGoodQuality
+      FROM quality_checks qc1
+      WHERE (
+        SELECT COUNT(*)
+        FROM quality_checks qc2
+        WHERE qc2.chapterId = qc1.chapterId
+        AND qc2.createdAt > qc1.createdAt
+      ) = 0
+    ) q ON c.id = q.chapterId`;
+
+interface ChapterRow {
+  id: string;
+  number: number;
+  title: string;
+  sourceContent: string;
+  translatedContent: string;
+  createdAt: number;
+  updatedAt: number;
+  score: number | null;
+  feedback: string | null;
+  isGoodQuality: number | null;
+}
+
+function mapChapterRow(row: ChapterRow): TranslationChapter {
+  const chapter: TranslationChapter = {
+    id: row.id,
+    number: row.number,
+    title: row.title,
+    sourceContent: row.sourceContent,
+    translatedContent: row.translatedContent,
+    createdAt: row.createdAt,
+    updatedAt: row.updatedAt,
+  };
+
+  if (row.score !== null) {
+    chapter.qualityCheck = {
+      score: row.score,
+      feedback: row.feedback || '',
+      isGoodQuality: Boolean(row.isGoodQuality),
+    };
+  }
+
+  return chapter;
+}
+
 // Get a single novel by ID with optional chapter range
 export async function getNovelById(
   idOrSlug: string,
@@ -95,60 +143,63 @@ export async function getNovelById(
   const chaptersQuery = `
     SELECT c.*, q.score, q.feedback, q.isGoodQuality
     FROM chapters c
-    LEFT JOIN (
-      SELECT chapterId, score, feedback, isGoodQuality
-      FROM quality_checks qc1
-      WHERE (
-        SELECT COUNT(*)
-        FROM quality_checks qc2
-        WHERE qc2.chapterId = qc1.chapterId
-        AND qc2.createdAt > qc1.createdAt
-      ) = 0
-    ) q ON c.id = q.chapterId
+    ${LATEST_QUALITY_CHECK_JOIN}
     WHERE c.novelId = ? AND c.number BETWEEN ? AND ?
     ORDER BY c.number
   `;
 
-  interface ChapterRow {
-    id: string;
-    number: number;
-    title: string;
-    sourceContent: string;
-    translatedContent: string;
-    createdAt: number;
-    updatedAt: number;
-    score: number | null;
-    feedback: string | null;
-    isGoodQuality: number | null;
-  }
-
   const rows = db
     .prepare(chaptersQuery)
     .all(targetNovel.id, chapterRange.start, chapterRange.end) as ChapterRow[];
 
-  const chapters = rows.map((row) => {
-    const chapter: TranslationChapter = {
-      id: row.id,
-      number: row.number,
-      title: row.title,
-      sourceContent: row.sourceContent,
-      translatedContent: row.translatedContent,
-      createdAt: row.createdAt,
-      updatedAt: row.updatedAt,
-    };
+  const chapters = rows.map(mapChapterRow);
 
-    if (row.score !== null) {
-      chapter.qualityCheck = {
-        score: row.score,
-        feedback: row.feedback || '',
-        isGoodQuality: Boolean(row.isGoodQuality),
-      };
-    }
+  return { ...targetNovel, chapters };
+}
 
-    return chapter;
-  });
+// Get the chapters that can be used as translation context: every chapter
+// other than the current one whose latest quality check scored at least
+// minScore. Also returns the position of the current chapter among all of
+// the novel's chapters (-1 if it doesn't exist, the chapter count if none
+// was given), so callers don't need to load every chapter to find it.
+export async function getContextChapters(
+  novelId: string,
+  currentChapterId: string | undefined,
+  minScore: number,
+): Promise<{ chapters: TranslationChapter[]; currentChapterIndex: number }> {
+  const db = getDb();
 
-  return { ...targetNovel, chapters };
+  const rows = db
+    .prepare(
+      `
+    SELECT c.*, q.score, q.feedback, q.isGoodQuality
+    FROM chapters c
+    ${LATEST_QUALITY_CHECK_JOIN}
+    WHERE c.novelId = ? AND c.id != ? AND q.score >= ?
+    ORDER BY c.number
+  `,
+    )
+    .all(novelId, currentChapterId ?? '', minScore) as ChapterRow[];
+
+  const current = currentChapterId
+    ? (db
+        .prepare(`SELECT number FROM chapters WHERE id = ? AND novelId = ?`)
+        .get(currentChapterId, novelId) as { number: number } | undefined)
+    : undefined;
+
+  let currentChapterIndex = -1;
+  if (!currentChapterId || current) {
+    const { count } = db
+      .prepare(
+        `
+      SELECT COUNT(*) as count FROM chapters WHERE novelId = ? AND number < ?
+    `,
+      )
+      .get(novelId, current ? current.number : Number.MAX_SAFE_INTEGER) as { count: number };
+    currentChapterIndex = count;
+  }
+
+  return { chapters: rows.map(mapChapterRow), currentChapterIndex };
 }
 
 export async function updateNovelProgress(
@@ -294,7 +345,14 @@ export async function saveNovel(novel: Novel): Promise<Novel> {
         title = excluded.title,
         content = excluded.content,
         tokenCount = excluded.tokenCount,
-        updatedAt = excluded.updatedAt,
+        -- Always move updatedAt forward when the text changes, even if the
+        -- caller passed the old value, and never move it back otherwise;
+        -- cached prompts rely on it to notice edits
+        updatedAt = CASE
+          WHEN "references".title IS NOT excluded.title OR "references".content IS NOT excluded.content
+            THEN MAX(excluded.updatedAt, "references".updatedAt + 1)
+          ELSE "references".updatedAt
+        END,
         updatedInChapterNumber = excluded.updatedInChapterNumber
     `);
 
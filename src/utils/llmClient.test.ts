@@ -0,0 +1,90 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { AxiosError, AxiosResponse, InternalAxiosRequestConfig } from 'axios';
+import { llmClient } from './llmClient';
+import { serverConfig } from '../../config';
+
+function respondWith(status: number, headers: Record<string, string> = {}) {
+  return async (config: InternalAxiosRequestConfig): Promise<AxiosResponse> => {
+    const response = { status, statusText: '', headers, config, data: {} } as AxiosResponse;
+    if (status >= 400) {
+      throw new AxiosError(
+        `Request failed with status code ${status}`,
+        AxiosError.ERR_BAD_RESPONSE,
+        config,
+        undefined,
+        response,
+      );
+    }
+    return response;
+  };
+}
+
+describe('llmClient retries', () => {
+  const adapter = vi.fn();
+  const originalAdapter = llmClient.defaults.adapter;
+
+  beforeEach(() => {
+    adapter.mockReset();
+    llmClient.defaults.adapter = adapter;
+    vi.spyOn(console, 'warn').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    llmClient.defaults.adapter = originalAdapter;
+    vi.restoreAllMocks();
+  });
+
+  it('should retry rate limited requests until they succeed', async () => {
+    adapter
+      .mockImplementationOnce(respondWith(429, { 'retry-after': '0' }))
+      .mockImplementationOnce(respondWith(429, { 'retry-after': '0' }))
+      .mockImplementation(respondWith(200));
+
+    const response = await llmClient.post('http://llm.test/chat/completions', {});
+
+    expect(response.status).toBe(200);
+    expect(adapter).toHaveBeenCalledTimes(3);
+  });
+
+  it('should stop after the maximum number of retries', async () => {
+    adapter.mockImplementation(respondWith(503, { 'retry-after': '0' }));
+
+    await expect(llmClient.post('http://llm.test/chat/completions', {})).rejects.toMatchObject({
+      response: { status: 503 },
+    });
+    expect(adapter).toHaveBeenCalledTimes(serverConfig.openaiMaxRetries + 1);
+  });
+
+  it('should not retry client errors', async () => {
+    adapter.mockImplementation(respondWith(400));
+
+    await expect(llmClient.post('http://llm.test/chat/completions', {})).rejects.toMatchObject({
+      response: { status: 400 },
+    });
+    expect(adapter).toHaveBeenCalledTimes(1);
+  });
+
+  it('should retry a connection reset on a reused socket', async () => {
+    adapter
+      .mockImplementationOnce(async (config: InternalAxiosRequestConfig) => {
+        throw new AxiosError('socket hang up', 'ECONNRESET', config);
+      })
+      .mockImplementation(respondWith(200));
+
+    const response = await llmClient.post('http://llm.test/chat/completions', {});
+
+    expect(response.status).toBe(200);
+    expect(adapter).toHaveBeenCalledTimes(2);
+  });
+
+  it('should stop waiting to retry once the request is aborted', async () => {
+    adapter.mockImplementation(respondWith(429, { 'retry-after': '30' }));
+    const controller = new AbortController();
+    setTimeout(() => controller.abort(), 10);
+
+    await expect(
+      llmClient.post('http://llm.test/chat/completions', {}, { signal: controller.signal }),
+    ).rejects.toMatchObject({ response: { status: 429 } });
+    expect(adapter).toHaveBeenCalledTimes(1);
+  });
+});
@@ -0,0 +1,99 @@
+import axios, { InternalAxiosRequestConfig } from 'axios';
+import http from 'http';
+import https from 'https';
+import { getRetryDelayMs, RETRYABLE_ERROR_CODES, RETRYABLE_STATUSES, waitForRetry } from './retry';
+import { serverConfig } from '../../config';
+
+// Keep-alive agents so consecutive chat completion calls reuse the same
+// TCP/TLS connection instead of paying a fresh handshake per request.
+// Concurrent translations (e.g. batch translation plus quality checks) share
+// a bounded pool; LIFO scheduling keeps the most recently used, still-warm
+// sockets busy and lets surplus idle ones time out.
+const agentOptions = {
+  keepAlive: true,
+  maxSockets: 64,
+  maxFreeSockets: 32,
+  scheduling: 'lifo' as const,
+};
+const httpAgent = new http.Agent(agentOptions);
+const httpsAgent = new https.Agent(agentOptions);
+
+// Shared axios instance for all requests to the OpenAI-compatible API.
+// Created once per server process and reused across API route invocations.
+export const llmClient = axios.create({
+  httpAgent,
+  httpsAgent,
+  timeout: serverConfig.openaiRequestTimeoutMs,
+  headers: {
+    'Content-Type': 'application/json',
+  },
+});
+
+// Retry rate limited and transient failures in place, so they don't surface
+// as failed translations that the user has to resubmit
+llmClient.interceptors.response.use(undefined, async (error: unknown) => {
+  if (!axios.isAxiosError(error) || !error.config) {
+    throw error;
+  }
+  const config = error.config as InternalAxiosRequestConfig & { retryCount?: number };
+  const attempt = config.retryCount ?? 0;
+  const retryable = error.response
+    ? RETRYABLE_STATUSES.has(error.response.status)
+    : RETRYABLE_ERROR_CODES.has(error.code ?? '');
+  if (!retryable || attempt >= serverConfig.openaiMaxRetries) {
+    throw error;
+  }
+
+  // Discard the error body of a streamed request so its socket can be reused
+  const data = error.response?.data as { destroy?: () => void } | undefined;
+  if (config.responseType === 'stream' && typeof data?.destroy === 'function') {
+    data.destroy();
+  }
+
+  const delay = getRetryDelayMs(attempt, error.response?.headers['retry-after']);
+  console.warn(
+    `Request failed with ${error.response ? `status ${error.response.status}` : error.code}, retrying in ${delay}ms (${attempt + 1}/${serverConfig.openaiMaxRetries})`,
+  );
+  // Stop waiting as soon as the caller gives up (e.g. the client disconnected)
+  const signal = config.signal as AbortSignal | undefined;
+  await waitForRetry(delay, signal);
+  if (signal?.aborted) {
+    throw error;
+  }
+
+  config.retryCount = attempt + 1;
+  return llmClient.request(config);
+});
+
+// Gemini (via its OpenAI-compatible endpoint) blocks a lot of web novel
+// content under the default safety thresholds.
+export const geminiSafetySettings = [
+  { category: 'HARM_CATEGORY_HARASSMENT', threshold: 'BLOCK_NONE' },
+  { category: 'HARM_CATEGORY_HATE_SPEECH', threshold: 'BLOCK_NONE' },
+  { category: 'HARM_CATEGORY_SEXUALLY_EXPLICIT', threshold: 'BLOCK_NONE' },
+  { category: 'HARM_CATEGORY_DANGEROUS_CONTENT', threshold: 'BLOCK_NONE' },
+  { category: 'HARM_CATEGORY_CIVIC_INTEGRITY', threshold: 'BLOCK_NONE' },
+];
+
+// Request options shared by every completion, built once instead of per request
+const GEMINI_OPTIONS = { safetySettings: geminiSafetySettings };
+const STREAM_OPTIONS = { stream: true, stream_options: { include_usage: true } };
+
+export function buildCompletionPayload(
+  model: string,
+  messages: { role: string; content: string }[],
+  temperature: number,
+  maxOutputTokens: number,
+  options: { stream?: boolean } = {},
+) {
+  return {
+    model,
+    messages,
+    temperature,
+    max_tokens: maxOutputTokens,
+    ...(options.stream ? STREAM_OPTIONS : {}),
+    ...(model.includes('gemini') ? GEMINI_OPTIONS : {}),
+  };
+}
+
+export default llmClient;
@@ -0,0 +1,42 @@
+import { describe, it, expect } from 'vitest';
+import { LruCache } from './lruCache';
+
+describe('LruCache', () => {
+  it('should return stored values and count hits and misses', () => {
+    const cache = new LruCache<string>(2);
+    cache.set('a', 'A');
+
+    expect(cache.get('a')).toBe('A');
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.stats()).toEqual({ size: 1, maxSize: 2, hits: 1, misses: 1 });
+  });
+
+  it('should evict the least recently used entry', () => {
+    const cache = new LruCache<string>(2);
+    cache.set('a', 'A');
+    cache.set('b', 'B');
+    cache.get('a');
+    cache.set('c', 'C');
+
+    expect(cache.get('a')).toBe('A');
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('c')).toBe('C');
+  });
+
+  it('should not store anything when max size is 0', () => {
+    const cache = new LruCache<string>(0);
+    cache.set('a', 'A');
+
+    expect(cache.get('a')).toBeUndefined();
+  });
+
+  it('should drop expired entries and count them as misses', () => {
+    const cache = new LruCache<{ value: string; expired: boolean }>(2, (entry) => entry.expired);
+    cache.set('a', { value: 'A', expired: true });
+    cache.set('b', { value: 'B', expired: false });
+
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.get('b')?.value).toBe('B');
+    expect(cache.stats()).toEqual({ size: 1, maxSize: 2, hits: 1, misses: 1 });
+  });
+});
@@ -0,0 +1,61 @@
+export interface CacheStats {
+  size: number;
+  maxSize: number;
+  hits: number;
+  misses: number;
+}
+
+// Minimal LRU cache, relying on Map preserving insertion order
+export class LruCache<V> {
+  private entries = new Map<string, V>();
+  private hits = 0;
+  private misses = 0;
+
+  // isExpired lets entries carry their own expiry; expired entries are
+  // dropped on lookup and count as misses
+  constructor(
+    private readonly maxSize: number,
+    private readonly isExpired?: (value: V) => boolean,
+  ) {}
+
+  get(key: string): V | undefined {
+    const value = this.entries.get(key);
+    if (value === undefined) {
+      this.misses += 1;
+      return undefined;
+    }
+    if (this.isExpired?.(value)) {
+      this.entries.delete(key);
+      this.misses += 1;
+      return undefined;
+    }
+    // Move to most recently used position
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    this.hits += 1;
+    return value;
+  }
+
+  set(key: string, value: V): void {
+    if (this.maxSize <= 0) return;
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    while (this.entries.size > this.maxSize) {
+      const oldestKey = this.entries.keys().next().value as string;
+      this.entries.delete(oldestKey);
+    }
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  stats(): CacheStats {
+    return {
+      size: this.entries.size,
+      maxSize: this.maxSize,
+      hits: this.hits,
+      misses: this.misses,
+    };
+  }
+}
@@ -0,0 +1,52 @@
+import { describe, it, expect } from 'vitest';
+import { formatNumberedLines, parseNumberedLines } from './numberedLines';
+
+describe('formatNumberedLines', () => {
+  it('should number each text on its own line', () => {
+    expect(formatNumberedLines(['一', '二', '三'])).toBe('1. 一\n2. 二\n3. 三');
+  });
+
+  it('should collapse newlines inside a text', () => {
+    expect(formatNumberedLines(['first line\n  second line'])).toBe(
+      '1. first line second line',
+    );
+  });
+});
+
+describe('parseNumberedLines', () => {
+  it('should return texts in numbered order', () => {
+    const result = parseNumberedLines('2. Two\n1. One\n3. Three', 3);
+
+    expect(result).toEqual(['One', 'Two', 'Three']);
+  });
+
+  it('should ignore lines without a number', () => {
+    const result = parseNumberedLines('Here are the translations:\n1. One\n2. Two\n', 2);
+
+    expect(result).toEqual(['One', 'Two']);
+  });
+
+  it('should join a translation wrapped over several lines', () => {
+    const result = parseNumberedLines('1. foo\nbar\n\n2. baz', 2);
+
+    expect(result).toEqual(['foo bar', 'baz']);
+  });
+
+  it('should return null when a number is missing', () => {
+    expect(parseNumberedLines('1. One\n3. Three', 3)).toBeNull();
+  });
+
+  it('should return null on duplicate numbers', () => {
+    expect(parseNumberedLines('1. One\n1. Uno\n2. Two', 2)).toBeNull();
+  });
+
+  it('should return null on numbers out of range', () => {
+    expect(parseNumberedLines('1. One\n2. Two\n3. Three', 2)).toBeNull();
+  });
+
+  it('should round-trip formatted texts', () => {
+    const texts = ['alpha', 'beta', 'gamma'];
+
+    expect(parseNumberedLines(formatNumberedLines(texts), texts.length)).toEqual(texts);
+  });
+});
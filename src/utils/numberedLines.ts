@@ -0,0 +1,48 @@
+/**
+ * Format texts as a numbered list ("1. foo\n2. bar") so several texts can be
+ * translated in a single completion. Newlines inside a text are collapsed to
+ * spaces, as each text must occupy exactly one line.
+ */
+export function formatNumberedLines(texts: string[]): string {
+  return texts
+    .map((text, index) => `${index + 1}. ${text.replace(/\s*\r?\n\s*/g, ' ').trim()}`)
+    .join('\n');
+}
+
+/**
+ * Parse a numbered list produced by the model back into an ordered array.
+ * Lines before the first number (a preamble) are ignored; later unnumbered
+ * lines continue the previous item, as the model may wrap a translation.
+ * Returns null unless every number from 1 to `expectedCount` is present
+ * exactly once, so callers can fall back to translating items one by one.
+ */
+export function parseNumberedLines(
+  content: string,
+  expectedCount: number,
+): string[] | null {
+  const lineRegex = /^\s*(\d+)\.\s(.*)$/;
+  const results = new Map<number, string>();
+  let previous: number | null = null;
+
+  for (const line of content.split(/\r?\n/)) {
+    const match = line.match(lineRegex);
+    if (!match) {
+      if (previous !== null && line.trim()) {
+        results.set(previous, `${results.get(previous)} ${line.trim()}`.trim());
+      }
+      continue;
+    }
+    const number = parseInt(match[1], 10);
+    if (number < 1 || number > expectedCount || results.has(number)) {
+      return null;
+    }
+    results.set(number, match[2].trim());
+    previous = number;
+  }
+
+  if (results.size !== expectedCount) {
+    return null;
+  }
+
+  return Array.from({ length: expectedCount }, (_, i) => results.get(i + 1) as string);
+}
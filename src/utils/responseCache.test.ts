@@ -0,0 +1,25 @@
+import { describe, it, expect } from 'vitest';
+import { getTranslationCacheKey } from './responseCache';
+
+describe('getTranslationCacheKey', () => {
+  const messages = [
+    { role: 'system', content: 'You are a translator.' },
+    { role: 'user', content: 'こんにちは' },
+  ];
+
+  it('should be stable for identical requests', () => {
+    expect(getTranslationCacheKey('gpt-4o', 0, messages)).toBe(
+      getTranslationCacheKey('gpt-4o', 0, messages.map((m) => ({ ...m }))),
+    );
+  });
+
+  it('should differ by model, temperature and messages', () => {
+    const key = getTranslationCacheKey('gpt-4o', 0, messages);
+
+    expect(getTranslationCacheKey('gpt-4o-mini', 0, messages)).not.toBe(key);
+    expect(getTranslationCacheKey('gpt-4o', 0.1, messages)).not.toBe(key);
+    expect(
+      getTranslationCacheKey('gpt-4o', 0, [messages[0], { role: 'user', content: 'さようなら' }]),
+    ).not.toBe(key);
+  });
+});
@@ -0,0 +1,96 @@
+import crypto from 'crypto';
+import { LruCache } from './lruCache';
+import getDb from './db';
+import { serverConfig } from '../../config';
+
+export interface CachedTranslation {
+  content: string;
+  usage: { prompt_tokens?: number; completion_tokens?: number; total_tokens?: number } | undefined;
+  finishReason: string | null;
+}
+
+// In-memory LRU in front of the translation_cache table. The table keeps
+// entries across restarts and shares them between server processes.
+export const translationCache = new LruCache<{ result: CachedTranslation; expiresAt: number }>(
+  serverConfig.translationCacheSize,
+  (entry) => entry.expiresAt <= Date.now(),
+);
+
+// Lookups that missed in memory but were found in the database
+let databaseHits = 0;
+
+export function getTranslationCacheStats() {
+  return { ...translationCache.stats(), databaseHits };
+}
+
+export function getCachedTranslation(key: string): CachedTranslation | undefined {
+  const cached = translationCache.get(key);
+  if (cached) return cached.result;
+
+  const row = getDb()
+    .prepare(
+      `
+    SELECT content, usage, finishReason, expiresAt
+    FROM translation_cache
+    WHERE key = ? AND expiresAt > ?
+  `,
+    )
+    .get(key, Date.now()) as
+    | { content: string; usage: string | null; finishReason: string | null; expiresAt: number }
+    | undefined;
+  if (!row) return undefined;
+  databaseHits += 1;
+
+  const result: CachedTranslation = {
+    content: row.content,
+    usage: row.usage ? JSON.parse(row.usage) : undefined,
+    finishReason: row.finishReason,
+  };
+  translationCache.set(key, { result, expiresAt: row.expiresAt });
+  return result;
+}
+
+export function setCachedTranslation(key: string, result: CachedTranslation): void {
+  const now = Date.now();
+  const expiresAt = now + serverConfig.translationCacheTtlSeconds * 1000;
+  translationCache.set(key, { result, expiresAt });
+
+  const db = getDb();
+  db.prepare(
+    `
+    INSERT INTO translation_cache (key, content, usage, finishReason, expiresAt)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+      content = excluded.content,
+      usage = excluded.usage,
+      finishReason = excluded.finishReason,
+      expiresAt = excluded.expiresAt
+  `,
+  ).run(
+    key,
+    result.content,
+    result.usage ? JSON.stringify(result.usage) : null,
+    result.finishReason,
+    expiresAt,
+  );
+  db.prepare(`DELETE FROM translation_cache WHERE expiresAt <= ?`).run(now);
+}
+
+// Deterministic requests are always cached; otherwise caching would return
+// the same output for a retranslation, so it has to be opted into.
+export function isTranslationCacheEnabled(temperature: number): boolean {
+  return temperature === 0 || serverConfig.translationCacheEnable;
+}
+
+export function getTranslationCacheKey(
+  model: string,
+  temperature: number,
+  messages: { role: string; content: string }[],
+): string {
+  const canonical = JSON.stringify([
+    model,
+    temperature,
+    messages.map((message) => [message.role, message.content]),
+  ]);
+  return crypto.createHash('sha256').update(canonical).digest('hex');
+}
@@ -0,0 +1,39 @@
+import { describe, it, expect } from 'vitest';
+import { getRetryDelayMs, RETRYABLE_STATUSES } from './retry';
+
+describe('getRetryDelayMs', () => {
+  it('should back off exponentially', () => {
+    expect(getRetryDelayMs(0)).toBe(500);
+    expect(getRetryDelayMs(1)).toBe(1000);
+    expect(getRetryDelayMs(4)).toBe(8000);
+  });
+
+  it('should cap the delay', () => {
+    expect(getRetryDelayMs(20)).toBe(60_000);
+    expect(getRetryDelayMs(0, '3600')).toBe(60_000);
+  });
+
+  it('should honor Retry-After in seconds', () => {
+    expect(getRetryDelayMs(3, '2')).toBe(2000);
+  });
+
+  it('should honor Retry-After as an HTTP date', () => {
+    const now = Date.parse('Wed, 21 Oct 2026 07:28:00 GMT');
+
+    expect(getRetryDelayMs(0, 'Wed, 21 Oct 2026 07:28:05 GMT', now)).toBe(5000);
+    expect(getRetryDelayMs(0, 'Wed, 21 Oct 2026 07:27:00 GMT', now)).toBe(0);
+  });
+
+  it('should fall back to backoff on an invalid Retry-After', () => {
+    expect(getRetryDelayMs(1, 'soon')).toBe(1000);
+  });
+});
+
+describe('RETRYABLE_STATUSES', () => {
+  it('should retry rate limits and transient errors only', () => {
+    expect(RETRYABLE_STATUSES.has(429)).toBe(true);
+    expect(RETRYABLE_STATUSES.has(503)).toBe(true);
+    expect(RETRYABLE_STATUSES.has(400)).toBe(false);
+    expect(RETRYABLE_STATUSES.has(401)).toBe(false);
+  });
+});
@@ -0,0 +1,46 @@
+// Response statuses worth retrying: timeouts, conflicts, rate limits and
+// transient upstream errors
+export const RETRYABLE_STATUSES = new Set([408, 409, 425, 429, 500, 502, 503, 504]);
+
+// Connection errors worth retrying, typically a keep-alive socket that the
+// server closed just as it was reused
+export const RETRYABLE_ERROR_CODES = new Set(['ECONNRESET', 'EPIPE']);
+
+const BACKOFF_BASE_MS = 500;
+const MAX_RETRY_DELAY_MS = 60_000;
+
+// Delay before the given retry (0 for the first), honoring a Retry-After
+// header given either in seconds or as an HTTP date
+export function getRetryDelayMs(
+  attempt: number,
+  retryAfter?: string | null,
+  now: number = Date.now(),
+): number {
+  if (retryAfter) {
+    const seconds = Number(retryAfter);
+    const delay = Number.isFinite(seconds)
+      ? seconds * 1000
+      : Date.parse(retryAfter) - now;
+    if (Number.isFinite(delay)) {
+      return Math.min(Math.max(delay, 0), MAX_RETRY_DELAY_MS);
+    }
+  }
+  return Math.min(BACKOFF_BASE_MS * 2 ** attempt, MAX_RETRY_DELAY_MS);
+}
+
+// Wait for the retry delay, returning early once the signal is aborted
+export function waitForRetry(delayMs: number, signal?: AbortSignal): Promise<void> {
+  return new Promise((resolve) => {
+    if (signal?.aborted) {
+      resolve();
+      return;
+    }
+    const done = () => {
+      clearTimeout(timer);
+      signal?.removeEventListener('abort', done);
+      resolve();
+    };
+    const timer = setTimeout(done, delayMs);
+    signal?.addEventListener('abort', done, { once: true });
+  });
+}
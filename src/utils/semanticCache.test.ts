@@ -0,0 +1,91 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+
+// Back the cache with an in-memory database holding just its table
+vi.mock('./db', async () => {
+  const { default: Database } = await import('better-sqlite3');
+  const db = new Database(':memory:');
+  db.exec(`
+    CREATE TABLE semantic_cache (
+      chapterId TEXT PRIMARY KEY,
+      sourceHash TEXT NOT NULL,
+      settingsHash TEXT NOT NULL,
+      sourceLength INTEGER NOT NULL,
+      embedding BLOB NOT NULL,
+      translation TEXT NOT NULL,
+      updatedAt INTEGER NOT NULL
+    )
+  `);
+  return { default: () => db };
+});
+vi.mock('./tokenizer', () => ({ embedTexts: vi.fn() }));
+
+import getDb from './db';
+import { addSemanticEntry, findSemanticMatch, getSemanticSettingsHash } from './semanticCache';
+
+function normalized(values: number[]): Float32Array {
+  const norm = Math.hypot(...values);
+  return Float32Array.from(values.map((v) => v / norm));
+}
+
+describe('semantic cache', () => {
+  const db = getDb();
+  const settings = getSemanticSettingsHash('gpt-4o', ['system prompt', 'references']);
+  const source = 'これは最初の章の本文です。'.repeat(10);
+  const editedSource = source.slice(0, -1) + '！';
+  const embedding = normalized([1, 0, 0]);
+  const similarEmbedding = normalized([1, 0.05, 0]);
+
+  beforeEach(() => {
+    db.exec('DELETE FROM semantic_cache');
+  });
+
+  it('should match a slightly edited source of the same chapter', () => {
+    addSemanticEntry('chapter-1', source, settings, embedding, 'Translation');
+
+    const match = findSemanticMatch('chapter-1', editedSource, settings, similarEmbedding);
+
+    expect(match?.translation).toBe('Translation');
+    expect(match?.similarity).toBeGreaterThan(0.95);
+  });
+
+  it('should not match an unchanged source, so retranslating gives a new translation', () => {
+    addSemanticEntry('chapter-1', source, settings, embedding, 'Translation');
+
+    expect(findSemanticMatch('chapter-1', source, settings, embedding)).toBeNull();
+  });
+
+  it('should not match entries of other chapters', () => {
+    addSemanticEntry('chapter-1', source, settings, embedding, 'Translation');
+
+    expect(findSemanticMatch('chapter-2', editedSource, settings, similarEmbedding)).toBeNull();
+  });
+
+  it('should not match entries made with other settings', () => {
+    addSemanticEntry('chapter-1', source, settings, embedding, 'Translation');
+    const otherSettings = getSemanticSettingsHash('gpt-4o', ['new system prompt', 'references']);
+
+    expect(findSemanticMatch('chapter-1', editedSource, otherSettings, similarEmbedding)).toBeNull();
+  });
+
+  it('should not match dissimilar sources or sources of a different length', () => {
+    addSemanticEntry('chapter-1', source, settings, embedding, 'Translation');
+
+    expect(
+      findSemanticMatch('chapter-1', editedSource, settings, normalized([0, 1, 0])),
+    ).toBeNull();
+    expect(
+      findSemanticMatch('chapter-1', source + source, settings, similarEmbedding),
+    ).toBeNull();
+  });
+
+  it('should keep a single entry per chapter', () => {
+    addSemanticEntry('chapter-1', source, settings, embedding, 'First');
+    addSemanticEntry('chapter-1', editedSource, settings, similarEmbedding, 'Second');
+
+    const { count } = db
+      .prepare('SELECT COUNT(*) as count FROM semantic_cache')
+      .get() as { count: number };
+    expect(count).toBe(1);
+    expect(findSemanticMatch('chapter-1', source, settings, embedding)?.translation).toBe('Second');
+  });
+});
@@ -0,0 +1,111 @@
+import crypto from 'crypto';
+import getDb from './db';
+import { embedTexts } from './tokenizer';
+import { serverConfig } from '../../config';
+
+// The embedding model only sees the start of a long chapter, so a match must
+// also have roughly the same source length to count as the same text.
+const MAX_LENGTH_DIFFERENCE_RATIO = 0.05;
+
+function hash(parts: string[]): string {
+  return crypto.createHash('sha256').update(JSON.stringify(parts)).digest('hex');
+}
+
+export async function embedSource(sourceContent: string): Promise<Float32Array | null> {
+  const embeddings = await embedTexts([sourceContent]);
+  return embeddings && embeddings[0] ? Float32Array.from(embeddings[0]) : null;
+}
+
+// Identifies everything besides the source that shapes a translation (model,
+// prompts, references), so entries made under other settings are never used
+export function getSemanticSettingsHash(model: string, promptParts: string[]): string {
+  return hash([model, serverConfig.embeddingModel, ...promptParts]);
+}
+
+function dot(a: Float32Array, b: Float32Array): number {
+  let sum = 0;
+  for (let i = 0; i < a.length; i++) {
+    sum += a[i] * b[i];
+  }
+  return sum;
+}
+
+// Find the stored translation of this chapter to reuse for a slightly edited
+// source (e.g. a re-scrape fixing punctuation). Only the chapter's own entry
+// is considered, and only when its source actually changed: translating the
+// same source again is a request for a new translation.
+export function findSemanticMatch(
+  chapterId: string,
+  sourceContent: string,
+  settingsHash: string,
+  embedding: Float32Array,
+): { translation: string; similarity: number } | null {
+  const row = getDb()
+    .prepare(
+      `
+    SELECT sourceHash, settingsHash, sourceLength, embedding, translation
+    FROM semantic_cache
+    WHERE chapterId = ?
+  `,
+    )
+    .get(chapterId) as
+    | {
+        sourceHash: string;
+        settingsHash: string;
+        sourceLength: number;
+        embedding: Buffer;
+        translation: string;
+      }
+    | undefined;
+
+  if (!row || row.settingsHash !== settingsHash) return null;
+  if (row.sourceHash === hash([sourceContent])) return null;
+
+  const lengthDifference = Math.abs(row.sourceLength - sourceContent.length);
+  if (lengthDifference > sourceContent.length * MAX_LENGTH_DIFFERENCE_RATIO) return null;
+
+  const stored = new Float32Array(
+    row.embedding.buffer.slice(row.embedding.byteOffset, row.embedding.byteOffset + row.embedding.byteLength),
+  );
+  if (stored.length !== embedding.length) return null;
+
+  // Embeddings are normalized, so the dot product is the cosine similarity
+  const similarity = dot(stored, embedding);
+  if (similarity < serverConfig.semanticCacheThreshold) return null;
+
+  return { translation: row.translation, similarity };
+}
+
+// Store the latest translation of a chapter, replacing any previous entry
+export function addSemanticEntry(
+  chapterId: string,
+  sourceContent: string,
+  settingsHash: string,
+  embedding: Float32Array,
+  translation: string,
+): void {
+  getDb()
+    .prepare(
+      `
+    INSERT INTO semantic_cache (
+      chapterId, sourceHash, settingsHash, sourceLength, embedding, translation, updatedAt
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(chapterId) DO UPDATE SET
+      sourceHash = excluded.sourceHash,
+      settingsHash = excluded.settingsHash,
+      sourceLength = excluded.sourceLength,
+      embedding = excluded.embedding,
+      translation = excluded.translation,
+      updatedAt = excluded.updatedAt
+  `,
+    )
+    .run(
+      chapterId,
+      hash([sourceContent]),
+      settingsHash,
+      sourceContent.length,
+      Buffer.from(embedding.buffer, embedding.byteOffset, embedding.byteLength),
+      translation,
+      Date.now(),
+    );
+}
@@ -0,0 +1,48 @@
+import { describe, it, expect, vi } from 'vitest';
+import { singleFlight } from './singleFlight';
+
+describe('singleFlight', () => {
+  it('should share the result of concurrent calls with the same key', async () => {
+    let resolve!: (value: string) => void;
+    const fn = vi.fn(() => new Promise<string>((r) => (resolve = r)));
+
+    const first = singleFlight('key', fn);
+    const second = singleFlight('key', fn);
+    resolve('done');
+
+    await expect(first).resolves.toBe('done');
+    await expect(second).resolves.toBe('done');
+    expect(fn).toHaveBeenCalledTimes(1);
+  });
+
+  it('should run calls with different keys separately', async () => {
+    const fn = vi.fn(async () => 'done');
+
+    await Promise.all([singleFlight('a', fn), singleFlight('b', fn)]);
+
+    expect(fn).toHaveBeenCalledTimes(2);
+  });
+
+  it('should run again once the previous call has finished', async () => {
+    const fn = vi.fn(async () => 'done');
+
+    await singleFlight('key', fn);
+    await singleFlight('key', fn);
+
+    expect(fn).toHaveBeenCalledTimes(2);
+  });
+
+  it('should share rejections and then allow a retry', async () => {
+    const failing = vi.fn(async () => {
+      throw new Error('failed');
+    });
+
+    const first = singleFlight('key', failing);
+    const second = singleFlight('key', failing);
+
+    await expect(first).rejects.toThrow('failed');
+    await expect(second).rejects.toThrow('failed');
+    expect(failing).toHaveBeenCalledTimes(1);
+    await expect(singleFlight('key', async () => 'ok')).resolves.toBe('ok');
+  });
+});
@@ -0,0 +1,16 @@
+const inFlight = new Map<string, Promise<unknown>>();
+
+// Run fn for the given key, unless a call for the same key is already in
+// progress, in which case its result is shared instead of running fn again.
+export function singleFlight<T>(key: string, fn: () => Promise<T>): Promise<T> {
+  const existing = inFlight.get(key);
+  if (existing) {
+    return existing as Promise<T>;
+  }
+
+  const promise = fn().finally(() => {
+    inFlight.delete(key);
+  });
+  inFlight.set(key, promise);
+  return promise;
+}
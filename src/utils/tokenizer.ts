@@ -1,5 +1,7 @@
 import { Worker } from 'worker_threads';
 import assert from 'assert';
+import crypto from 'crypto';
+import { LruCache } from './lruCache';
 import { serverConfig } from '../../config';
 
 interface WorkerMessage {
@@ -22,25 +24,48 @@ const pendingMessages = new Map<number, PendingMessage>();
 // Inline worker code as a string to avoid bundling issues
 const workerCode = `
 import { parentPort } from 'worker_threads';
-import { AutoTokenizer } from '@huggingface/transformers';
+import { AutoTokenizer, pipeline } from '@huggingface/transformers';
 
 let encoder = null;
+let encoderPromise = null;
+let extractor = null;
+let extractorPromise = null;
 
 async function initTokenizer(modelName, cacheDir) {
-  console.log('Initializing tokenizer', modelName, cacheDir);
   if (!encoder) {
-    try {
-      encoder = await AutoTokenizer.from_pretrained(modelName, {
+    // Share a single load between concurrent init requests
+    if (!encoderPromise) {
+      console.log('Initializing tokenizer', modelName, cacheDir);
+      encoderPromise = AutoTokenizer.from_pretrained(modelName, {
         progress_callback: undefined,
         cache_dir: cacheDir,
       });
+    }
+    try {
+      encoder = await encoderPromise;
     } catch (error) {
+      encoderPromise = null;
       throw new Error(\`Error initializing tokenizer: \${error.message}\`);
     }
   }
   return encoder;
 }
 
+function countTokensPerMessage(messages) {
+  if (!encoder) {
+    throw new Error('Tokenizer not initialized');
+  }
+
+  return messages.map((message) => {
+    try {
+      return encoder.encode(message.content).length;
+    } catch {
+      // Leave the estimate to the caller, which must not cache it
+      return null;
+    }
+  });
+}
+
 async function countMessagesTokens(messages) {
   if (!encoder) {
     throw new Error('Tokenizer not initialized');
@@ -64,6 +89,27 @@ async function countMessagesTokens(messages) {
   }
 }
 
+async function embedTexts(modelName, cacheDir, texts) {
+  if (!extractor) {
+    // Share a single load between concurrent embedding requests
+    if (!extractorPromise) {
+      extractorPromise = pipeline('feature-extraction', modelName, {
+        progress_callback: undefined,
+        cache_dir: cacheDir,
+      });
+    }
+    try {
+      extractor = await extractorPromise;
+    } catch (error) {
+      extractorPromise = null;
+      throw new Error(\`Error initializing embedding model: \${error.message}\`);
+    }
+  }
+  // Mean-pooled, L2-normalized sentence embeddings
+  const output = await extractor(texts, { pooling: 'mean', normalize: true });
+  return output.tolist();
+}
+
 // Handle messages from the main thread
 parentPort.on('message', async (data) => {
   const { id, type, payload } = data;
@@ -80,6 +126,16 @@ parentPort.on('message', async (data) => {
         parentPort.postMessage({ id, type: 'success', result: tokenCount });
         break;
 
+      case 'countTokensBatch':
+        const tokenCounts = countTokensPerMessage(payload.messages);
+        parentPort.postMessage({ id, type: 'success', result: tokenCounts });
+        break;
+
+      case 'embed':
+        const embeddings = await embedTexts(payload.modelName, payload.cacheDir, payload.texts);
+        parentPort.postMessage({ id, type: 'success', result: embeddings });
+        break;
+
       default:
         throw new Error(\`Unknown message type: \${type}\`);
     }
@@ -137,17 +193,24 @@ function sendWorkerMessage(type: string, payload: unknown): Promise<unknown> {
   });
 }
 
+// Resolved once the worker has loaded the tokenizer, so later calls skip the
+// init round trip to the worker
+let initPromise: Promise<boolean> | null = null;
+
 export async function initTokenizer(): Promise<boolean> {
-  try {
+  if (!initPromise) {
     const modelName = serverConfig.tokenizerModel;
     const cacheDir = './data/cache';
-    
-    await sendWorkerMessage('init', { modelName, cacheDir });
-    return true;
-  } catch (error) {
-    console.error('Error initializing tokenizer:', error);
-    throw error;
+
+    initPromise = sendWorkerMessage('init', { modelName, cacheDir })
+      .then(() => true)
+      .catch((error) => {
+        initPromise = null;
+        console.error('Error initializing tokenizer:', error);
+        throw error;
+      });
   }
+  return initPromise;
 }
 
 interface ChatMessage {
@@ -175,6 +238,74 @@ export async function countMessagesTokens(
   }
 }
 
+// Token counts by content hash. Previous chapters are sent as context with
+// every translation request, and their content rarely changes, so most
+// messages only ever need to be tokenized once.
+const tokenCountCache = new LruCache<number>(4096);
+
+function getTokenCountCacheKey(content: string): string {
+  return crypto.createHash('sha1').update(content).digest('base64');
+}
+
+// Count tokens of each message separately, in a single round trip to the
+// worker for the messages that aren't cached yet
+export async function countTokensPerMessage(
+  messages: ChatMessage[],
+): Promise<number[]> {
+  if (messages.length === 0) return [];
+
+  const keys = messages.map((msg) => getTokenCountCacheKey(msg.content));
+  const counts = keys.map((key) => tokenCountCache.get(key));
+  const uncachedIndexes = counts.flatMap((count, i) => (count === undefined ? [i] : []));
+  if (uncachedIndexes.length === 0) {
+    return counts as number[];
+  }
+
+  try {
+    await initTokenizer();
+
+    const tokenCounts = await sendWorkerMessage('countTokensBatch', {
+      messages: uncachedIndexes.map((i) => messages[i]),
+    });
+    if (!Array.isArray(tokenCounts) || tokenCounts.length !== uncachedIndexes.length) {
+      throw new Error('Unexpected token counts from worker');
+    }
+    uncachedIndexes.forEach((messageIndex, i) => {
+      const count = tokenCounts[i];
+      if (typeof count === 'number') {
+        counts[messageIndex] = count;
+        tokenCountCache.set(keys[messageIndex], count);
+      } else {
+        // Encoding failed: use a conservative estimate, but don't cache it
+        counts[messageIndex] = Math.ceil(messages[messageIndex].content.length / 4);
+      }
+    });
+    return counts as number[];
+  } catch (error) {
+    console.error('Error counting tokens:', error);
+    // Return a conservative estimate if tokenizer fails
+    return messages.map((msg, i) => counts[i] ?? Math.ceil(msg.content.length / 4));
+  }
+}
+
+// Compute normalized sentence embeddings, or null if the embedding model is unavailable
+export async function embedTexts(texts: string[]): Promise<number[][] | null> {
+  try {
+    const embeddings = await sendWorkerMessage('embed', {
+      modelName: serverConfig.embeddingModel,
+      cacheDir: './data/cache',
+      texts,
+    });
+    return Array.isArray(embeddings) ? (embeddings as number[][]) : null;
+  } catch (error) {
+    console.error('Error computing embeddings:', error);
+    return null;
+  }
+}
+
+// Number of previous translation pairs tokenized per worker round trip
+const PAIRS_PER_TOKEN_COUNT_WINDOW = 8;
+
 export async function truncateContext(
   messages: { role: string; content: string }[],
   maxTokens: number = serverConfig.maxTokens,
@@ -199,13 +330,9 @@ export async function truncateContext(
     messages[1], // References
     messages[messages.length - 1], // Task
   ];
-  const systemTokenCount = await countMessagesTokens([
-    messages[0],
-    messages[1],
-  ]);
-  const taskTokenCount = await countMessagesTokens([
-    messages[messages.length - 1],
-  ]);
+  const [systemPromptTokens, referencesTokens, taskTokenCount] =
+    await countTokensPerMessage(baseMessages);
+  const systemTokenCount = systemPromptTokens + referencesTokens;
 
   if (systemTokenCount + taskTokenCount > maxTokens) {
     throw new Error(
@@ -213,29 +340,34 @@ export async function truncateContext(
     );
   }
 
-  // Get the translation messages
-  const translationMessages = messages.slice(2, -1);
+  // Translation messages sit between the references and the task (indexes 2..length-2)
+  const translationCount = messages.length - 3;
   assert(
-    translationMessages.length % 2 === 0,
+    translationCount % 2 === 0,
     'Translation messages must be in pairs',
   );
-  const pairs = translationMessages.length / 2;
+  const pairs = translationCount / 2;
 
-  // Greedily add translation pairs from the end until we hit the limit
+  // Greedily add translation pairs from the end until we hit the limit.
+  // Pairs are tokenized a window at a time, newest first, so chapters that
+  // can't fit in the budget anyway are never tokenized.
   let bestCount = 0;
-  let translationTokens = 0;
   let bestTokenCount = systemTokenCount + taskTokenCount;
-  for (let i = translationMessages.length - 2; i >= 0; i -= 2) {
-    const pair = [translationMessages[i], translationMessages[i + 1]];
-    const pairTokens = await countMessagesTokens(pair);
-    const projected = systemTokenCount + taskTokenCount + translationTokens + pairTokens;
-    if (projected <= maxTokens) {
-      translationTokens += pairTokens;
+  let nextPairEnd = messages.length - 1; // exclusive end of the next pair to consider
+  let budgetExhausted = false;
+  while (!budgetExhausted && nextPairEnd > 2) {
+    const windowStart = Math.max(2, nextPairEnd - PAIRS_PER_TOKEN_COUNT_WINDOW * 2);
+    const windowCounts = await countTokensPerMessage(messages.slice(windowStart, nextPairEnd));
+    for (let i = windowCounts.length - 2; i >= 0; i -= 2) {
+      const projected = bestTokenCount + windowCounts[i] + windowCounts[i + 1];
+      if (projected > maxTokens) {
+        budgetExhausted = true;
+        break;
+      }
       bestCount += 1;
       bestTokenCount = projected;
-    } else {
-      break;
     }
+    nextPairEnd = windowStart;
   }
 
   if (pairs > 0 && bestCount === 0) {
@@ -248,9 +380,7 @@ export async function truncateContext(
   const result = [
     baseMessages[0],
     baseMessages[1],
-    ...translationMessages.slice(
-      translationMessages.length - bestCount * 2,
-    ),
+    ...messages.slice(messages.length - 1 - bestCount * 2, messages.length - 1),
     baseMessages[2],
   ];
 
@@ -270,6 +400,7 @@ export function terminateTokenizer(): void {
   if (worker) {
     worker.terminate();
     worker = null;
+    initPromise = null;
     // Reject any pending messages
     for (const [id, pending] of pendingMessages.entries()) {
       pending.reject(new Error('Worker terminated'));
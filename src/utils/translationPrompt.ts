@@ -0,0 +1,69 @@
+import { Novel, Reference, TranslationPostprocessOptions } from '@/types';
+import { LruCache } from './lruCache';
+import { countTokensPerMessage } from './tokenizer';
+import { serverConfig } from '../../config';
+
+// Server-side post-processing applied to every translation
+export const postprocessOptions: TranslationPostprocessOptions = {
+  removeXmlTags: serverConfig.postprocessRemoveXmlTags,
+  removeCodeBlocks: serverConfig.postprocessRemoveCodeBlocks,
+  trimWhitespace: serverConfig.postprocessTrimWhitespace,
+  truncateAfterSecondHeader: serverConfig.postprocessTruncateAfterSecondHeader,
+};
+
+// Formatted references block per novel, rebuilt only when a reference changes
+const referencesTextCache = new LruCache<{ signature: string; text: string }>(64);
+
+export async function getReferencesText(novel: Novel): Promise<string> {
+  if (novel.references.length === 0) return '';
+
+  // saveNovel only ever moves a reference's updatedAt forward, and does so
+  // whenever its text changes, so the count and the sum of updatedAt change
+  // with every edit or addition
+  const signature = `${novel.references.length}:${novel.references.reduce(
+    (sum, ref) => sum + (ref.updatedAt ?? 0),
+    0,
+  )}`;
+  const cached = referencesTextCache.get(novel.id);
+  if (cached && cached.signature === signature) {
+    return cached.text;
+  }
+
+  // Format references with titles
+  let formatted = novel.references.map(
+    (ref: Reference) =>
+      `<ref id="${ref.id}" title="${ref.title}">\n${ref.content}\n</ref>`,
+  );
+
+  // Keep the references within the token budget, in order, skipping those
+  // that don't fit in what remains of it
+  const maxReferenceTokens = serverConfig.maxReferenceTokens;
+  if (maxReferenceTokens > 0) {
+    const tokenCounts = await countTokensPerMessage(
+      formatted.map((content) => ({ role: 'system', content })),
+    );
+    let remaining = maxReferenceTokens;
+    const dropped: string[] = [];
+    formatted = formatted.filter((_, i) => {
+      if (tokenCounts[i] > remaining) {
+        dropped.push(novel.references[i].title);
+        return false;
+      }
+      remaining -= tokenCounts[i];
+      return true;
+    });
+    if (dropped.length > 0) {
+      console.warn(
+        `References exceed MAX_REFERENCE_TOKENS (${maxReferenceTokens}) for novel ${novel.id}, leaving out: ${dropped.join(', ')}`,
+      );
+    }
+  }
+
+  const parts = formatted.length === 0 ? [] : [
+    "Here are references to use to assist in translation. Use them to help with the translation, but don't mention them in the translation:",
+    formatted.join('\n\n'),
+  ];
+  const text = parts.join('\n');
+  referencesTextCache.set(novel.id, { signature, text });
+  return text;
+}
@@ -0,0 +1,94 @@
+// Kept outside pages/, where Next.js would serve any file as a route
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import type { NextApiRequest, NextApiResponse } from 'next';
+
+vi.mock('@/utils/fileStorage', () => ({ getNovelById: vi.fn() }));
+vi.mock('@/utils/batchTranslate', async (importOriginal) => ({
+  ...(await importOriginal<typeof import('@/utils/batchTranslate')>()),
+  translateTexts: vi.fn(),
+}));
+
+import { getNovelById } from '@/utils/fileStorage';
+import { MAX_TEXTS_PER_REQUEST, translateTexts } from '@/utils/batchTranslate';
+import handler from '../../pages/api/translate-batch';
+
+function createResponse() {
+  const res = {
+    statusCode: 0,
+    body: undefined as unknown,
+    status(code: number) {
+      res.statusCode = code;
+      return res;
+    },
+    json(body: unknown) {
+      res.body = body;
+      return res;
+    },
+  };
+  return res;
+}
+
+async function post(body: unknown) {
+  const res = createResponse();
+  await handler(
+    { method: 'POST', body } as NextApiRequest,
+    res as unknown as NextApiResponse,
+  );
+  return res;
+}
+
+describe('/api/translate-batch', () => {
+  beforeEach(() => {
+    vi.mocked(getNovelById).mockReset();
+    vi.mocked(translateTexts).mockReset();
+  });
+
+  it('should return the translations in order', async () => {
+    vi.mocked(getNovelById).mockResolvedValue({
+      id: 'novel-1',
+      sourceLanguage: 'Japanese',
+      targetLanguage: 'English',
+    } as Awaited<ReturnType<typeof getNovelById>>);
+    vi.mocked(translateTexts).mockResolvedValue(['One', 'Two']);
+
+    const res = await post({ novelId: 'novel-1', texts: ['一', '二'] });
+
+    expect(res.statusCode).toBe(200);
+    expect(res.body).toEqual({
+      translations: ['One', 'Two'],
+      sourceLanguage: 'Japanese',
+      targetLanguage: 'English',
+    });
+  });
+
+  it('should reject invalid texts', async () => {
+    const res = await post({ novelId: 'novel-1', texts: ['一', 2] });
+
+    expect(res.statusCode).toBe(400);
+    expect(translateTexts).not.toHaveBeenCalled();
+  });
+
+  it('should reject more texts than the limit', async () => {
+    const texts = Array.from({ length: MAX_TEXTS_PER_REQUEST + 1 }, () => '一');
+
+    const res = await post({ novelId: 'novel-1', texts });
+
+    expect(res.statusCode).toBe(400);
+    expect(translateTexts).not.toHaveBeenCalled();
+  });
+
+  it('should return 404 for an unknown novel', async () => {
+    vi.mocked(getNovelById).mockResolvedValue(null);
+
+    const res = await post({ novelId: 'missing', texts: ['一'] });
+
+    expect(res.statusCode).toBe(404);
+  });
+
+  it('should reject other methods', async () => {
+    const res = createResponse();
+    await handler({ method: 'GET' } as NextApiRequest, res as unknown as NextApiResponse);
+
+    expect(res.statusCode).toBe(405);
+  });
+});